@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from pymodaq_plugins_teaching.extensions.myextension import MyExtension
+from pymodaq_plugins_teaching.extensions.render_scheduler import ChannelLayout
+from pymodaq_plugins_teaching.extensions.statistics import StatisticsStage
+
+
+class NullViewer:
+    """Viewer discarding the data so that only the extension data path is measured"""
+    def show_data(self, *args, **kwargs):
+        pass
+
+    def setImage(self, *args, **kwargs):
+        pass
+
+
+def synthetic_payload(n_detectors: int, n_channels: int, nx: int) -> dict:
+    """Build a det_done_signal like payload: per detector, 1D and 2D channels holding a 'data' array"""
+    data1D = np.random.rand(nx)
+    data2D = np.random.rand(128, nx)
+    return {f'det{ind_det:02d}': {
+        'data0D': dict([]),
+        'data1D': {f'CH{ind:02d}': {'data': data1D} for ind in range(n_channels)},
+        'data2D': {f'CH{ind:02d}': {'data': data2D} for ind in range(n_channels)}}
+        for ind_det in range(n_detectors)}
+
+
+@pytest.mark.parametrize('n_detectors', [1, 8], ids=lambda n: f'detectors={n}')
+def bench_render_data(benchmark, n_detectors, nx):
+    """Dict flattening and viewers update of a new frame (all channels changed)"""
+    extension = SimpleNamespace(viewer1D=NullViewer(), viewer2D=NullViewer(), channel_layout=ChannelLayout(),
+                                statistics=StatisticsStage())
+    payloads = [synthetic_payload(n_detectors, 4, nx) for _ in range(2)]
+    frames = iter(range(10 ** 9))
+    benchmark(lambda: MyExtension.render_data(extension, payloads[next(frames) % 2]))
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import pytest
+
+from pymodaq_plugins_teaching.hardware.keithley import Keithley2110
+from pymodaq_plugins_teaching.hardware.serial_addresses import SerialAddresses
+
+
+@pytest.fixture
+def meter():
+    meter = Keithley2110(SerialAddresses.names()[0])
+    meter.noise_generator.seed(0)
+    yield meter
+    meter.close()
+
+
+def bench_get_reading(benchmark, meter):
+    benchmark(meter.get_reading)
+
+
+def bench_fetch_buffer(benchmark, meter, n_frames):
+    meter.set_sample_count(n_frames)
+    benchmark(meter.fetch_buffer)
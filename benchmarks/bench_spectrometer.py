@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+
+def bench_grab_spectrum(benchmark, spectro):
+    benchmark(spectro.grab_spectrum)
+
+
+def bench_grab_spectrum_preallocated(benchmark, spectro):
+    out = np.empty(spectro.spectrum_shape)
+    benchmark(spectro.grab_spectrum, out=out)
+
+
+def bench_grab_image(benchmark, spectro):
+    benchmark(spectro.grab_image)
+
+
+def bench_grab_image_preallocated(benchmark, spectro):
+    out = np.empty(spectro.image_shape)
+    benchmark(spectro.grab_image, out=out)
+
+
+def bench_grab_monochromator(benchmark, spectro):
+    benchmark(spectro.grab_monochromator)
+
+
+def bench_get_wavelength_moving(benchmark, spectro):
+    spectro.set_wavelength(600)
+    benchmark(spectro.get_wavelength)
+
+
+def bench_grab_spectra(benchmark, spectro, n_frames):
+    benchmark(spectro.grab_spectra, n_frames)
+
+
+def bench_grab_spectrum_loop(benchmark, spectro, n_frames):
+    """Reference for bench_grab_spectra: the same frames acquired one call at a time"""
+    def grab():
+        return [spectro.grab_spectrum() for _ in range(n_frames)]
+    benchmark(grab)
+
+
+@pytest.mark.parametrize('n_peaks', [1, 50], ids=lambda n: f'peaks={n}')
+def bench_line_shape_many_peaks(benchmark, spectro, n_peaks):
+    centers = np.linspace(450, 620, n_peaks)
+
+    def evaluate():
+        spectro.peaks = [(center, 1., 5., 'voigt') for center in centers]
+        return spectro.grab_spectrum()
+    benchmark(evaluate)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Throughput/latency benchmarks of the hardware mocks and of the extension data path, using pytest-benchmark
+
+Each run is compared to the last baseline stored in benchmarks/baselines for the running machine (pytest-benchmark
+keeps one sub folder per platform and interpreter) and fails if a mean time regressed by more than the threshold set
+in benchmarks/pytest.ini. Timings only compare on the same hardware, so the baselines are not committed: the CI first
+benchmarks the parent commit on its runner, saving the baseline, then benchmarks the pushed commit against it. Store
+a local baseline before optimizing with:
+
+    pytest benchmarks --benchmark-autosave
+
+Without a baseline for the running machine, the comparison is skipped with a warning. The benchmarks are not part of
+the default pytest run of the repository, see the root pytest.ini.
+"""
+import warnings
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.utils import get_machine_id
+
+from pymodaq_plugins_teaching.hardware.spectrometer import Spectrometer
+
+
+BASELINES = Path(__file__).parent.joinpath('baselines')
+NX_SIZES = [256, 2048, 16384]
+FRAME_COUNTS = [1, 100, 1000]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Store the baselines next to the benchmarks whatever the working directory, unless another storage is given,
+    and skip the regression check if there is no baseline to compare to"""
+    storage = config.getoption('benchmark_storage', None)
+    if storage == 'file://./.benchmarks':
+        storage = config.option.benchmark_storage = f'file://{BASELINES}'
+    if storage is not None and storage.startswith('file://') and \
+            not any(Path(storage[len('file://'):]).joinpath(get_machine_id()).glob('*.json')):
+        warnings.warn(f'No benchmark baseline stored for {get_machine_id()}, the regression check is skipped')
+        config.option.benchmark_compare_fail = None
+
+
+@pytest.fixture(params=NX_SIZES, ids=lambda nx: f'Nx={nx}')
+def nx(request) -> int:
+    return request.param
+
+
+@pytest.fixture(params=FRAME_COUNTS, ids=lambda n: f'frames={n}')
+def n_frames(request) -> int:
+    return request.param
+
+
+@pytest.fixture
+def spectro(nx):
+    spectro = Spectrometer()
+    spectro.Nx = nx
+    spectro.noise_generator.seed(0)
+    return spectro
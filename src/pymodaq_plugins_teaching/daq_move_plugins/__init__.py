@@ -1,12 +1,9 @@
-import importlib
 from pathlib import Path
 from pymodaq.utils.logger import set_logger
+from pymodaq_plugins_teaching.utils import LazyPlugins
 logger = set_logger('move_plugins', add_to_console=False)
 
-for path in Path(__file__).parent.iterdir():
-    try:
-        if '__init__' not in str(path):
-            importlib.import_module('.' + path.stem, __package__)
-    except Exception as e:
-        logger.warning("{:} plugin couldn't be loaded due to some missing packages or errors: {:}".format(path.stem, str(e)))
-        pass
+# plugin modules are only imported on first access, path is used by pymodaq to discover them
+path = Path(__file__)
+plugins = LazyPlugins(__package__, path, logger)
+__getattr__, __dir__ = plugins.getattr, plugins.dir
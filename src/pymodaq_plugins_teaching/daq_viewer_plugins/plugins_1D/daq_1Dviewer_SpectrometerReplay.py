@@ -0,0 +1,77 @@
+import numpy as np
+
+from pymodaq.control_modules.viewer_utility_classes import DAQ_Viewer_base, comon_parameters, main
+from pymodaq.utils.data import Axis, DataFromPlugins, DataToExport
+from pymodaq.utils.parameter import Parameter
+
+from pymodaq_plugins_teaching.hardware.spectrometer import Spectrometer
+from pymodaq_plugins_teaching.utils import replay_params, load_replay
+
+
+class DAQ_1DViewer_SpectrometerReplay(DAQ_Viewer_base):
+    """Spectrometer serving spectra replayed from recorded data instead of synthesized ones
+
+    Recorded images are vertically summed into spectra.
+    """
+    params = comon_parameters + replay_params
+
+    def ini_attributes(self):
+        self.controller: Spectrometer = None
+        self.x_axis: Axis = None
+
+    def commit_settings(self, param: Parameter):
+        """Reload the recorded frames whenever one of the replay settings changed"""
+        if param.name() in ('replay_file', 'dataset', 'rate', 'loop', 'dtype', 'frame_shape'):
+            load_replay(self.controller, self.settings)
+            self.x_axis = None
+
+    def ini_detector(self, controller=None):
+        """Detector communication initialization
+
+        Parameters
+        ----------
+        controller: (object)
+            custom object of a PyMoDAQ plugin (Slave case). None if only one actuator/detector by controller
+            (Master case)
+
+        Returns
+        -------
+        info: str
+        initialized: bool
+            False if initialization failed otherwise True
+        """
+        self.ini_detector_init(old_controller=controller, new_controller=Spectrometer())
+        if self.settings['controller_status'] == 'Master':
+            load_replay(self.controller, self.settings)
+        info = 'Replaying recorded frames' if self.controller.replaying else 'No recorded frames loaded'
+        initialized = True
+        return info, initialized
+
+    def close(self):
+        """Terminate the communication protocol"""
+        self.controller.close_communication()
+
+    def grab_data(self, Naverage=1, **kwargs):
+        """Start a grab from the detector
+
+        Parameters
+        ----------
+        Naverage: int
+            Number of hardware averaging
+        kwargs: dict
+            others optionals arguments
+        """
+        data = np.mean(self.controller.grab_spectra(Naverage), axis=0)
+        if self.x_axis is None or self.x_axis.size != data.size:
+            self.x_axis = Axis('pixels', data=np.arange(data.size), index=0)
+        self.dte_signal.emit(DataToExport('SpectrometerReplay',
+                                          data=[DataFromPlugins(name='Spectrum', data=[data], dim='Data1D',
+                                                                labels=['Replay'], axes=[self.x_axis])]))
+
+    def stop(self):
+        """Stop the current grab hardware wise if necessary"""
+        return ''
+
+
+if __name__ == '__main__':
+    main(__file__)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import queue
+import threading
+from pathlib import Path
+from time import time
+from typing import Dict, Tuple, Union
+
+import h5py
+import numpy as np
+from pymodaq.utils.logger import set_logger, get_module_name
+
+logger = set_logger(get_module_name(__file__))
+
+COMPRESSIONS = ['none', 'gzip', 'lzf']
+DIMS = ['data0D', 'data1D', 'data2D']
+
+
+class _ChannelBuffer:
+    """Block of frames of a channel waiting to be appended to its dataset"""
+
+    def __init__(self, dataset: h5py.Dataset, timestamps: h5py.Dataset, block_size: int):
+        self.dataset = dataset
+        self.timestamps = timestamps
+        self.frames = np.empty((block_size,) + dataset.shape[1:], dataset.dtype)
+        self.times = np.empty((block_size,))
+        self.count = 0
+
+    def append(self, data: np.ndarray, timestamp: float):
+        self.frames[self.count] = data
+        self.times[self.count] = timestamp
+        self.count += 1
+        if self.count == len(self.frames):
+            self.flush()
+
+    def flush(self):
+        if self.count == 0:
+            return
+        start = self.dataset.shape[0]
+        self.dataset.resize(start + self.count, axis=0)
+        self.dataset[start:] = self.frames[:self.count]
+        self.timestamps.resize(start + self.count, axis=0)
+        self.timestamps[start:] = self.times[:self.count]
+        self.count = 0
+
+
+class H5StreamWriter:
+    """Save det_done_signal data into a HDF5 file from a background thread
+
+    Each channel is appended to its own extendable and chunked dataset (/detector/dim/channel) along with a dataset of
+    the frames timestamps. Frames go through a bounded queue, then are grouped into blocks of chunk_frames before
+    being written, so memory use stays constant whatever the duration of the acquisition.
+
+    Parameters
+    ----------
+    path: str or Path
+        the HDF5 file to create
+    compression: str
+        one of COMPRESSIONS
+    chunk_frames: int
+        the number of frames per HDF5 chunk (and per write)
+    queue_size: int
+        the maximum number of frames waiting to be written
+    blocking: bool
+        if True, submit waits for room in the queue, else frames submitted to a full queue are dropped and counted
+    """
+
+    def __init__(self, path: Union[str, Path], compression: str = 'none', chunk_frames: int = 64,
+                 queue_size: int = 256, blocking: bool = False):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f'The compression should be one of {COMPRESSIONS}, not {compression}')
+        if chunk_frames < 1:
+            raise ValueError(f'The number of frames per chunk should be strictly positive, not {chunk_frames}')
+        self.path = Path(path)
+        self._compression = None if compression == 'none' else compression
+        self._chunk_frames = chunk_frames
+        self._blocking = blocking
+        self._queue = queue.Queue(queue_size)
+        self._thread: threading.Thread = None
+        self._buffers: Dict[Tuple[str, str, str], _ChannelBuffer] = dict([])
+        self.written = 0
+        self.dropped = 0
+        self.error: Exception = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Create the file and start the writer thread"""
+        if self.running:
+            raise RuntimeError('The writer is already running')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._write_loop, args=(h5py.File(self.path, 'w'),),
+                                        name='H5StreamWriter', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write the frames still queued, then close the file"""
+        if self._thread is not None:
+            if self._thread.is_alive():
+                self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, data_all: dict, timestamp: float = None) -> bool:
+        """Queue a copy of the det_done_signal data to be written
+
+        Returns
+        -------
+        bool: False if the frame has been dropped because the queue is full
+        """
+        if not self.running:
+            raise RuntimeError('The writer is not running')
+        if timestamp is None:
+            timestamp = time()
+        frame = [(det, dim, channel, np.array(data_all[det][dim][channel]['data']))
+                 for det in data_all for dim in DIMS if dim in data_all[det] for channel in data_all[det][dim]]
+        try:
+            self._queue.put((timestamp, frame), block=self._blocking)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def _get_buffer(self, h5file: h5py.File, det: str, dim: str, channel: str, data: np.ndarray) -> _ChannelBuffer:
+        key = (det, dim, channel)
+        if key not in self._buffers:
+            group = h5file.require_group(f"{det.replace('/', '_')}/{dim}")
+            name = channel.replace('/', '_')
+            frame_size = max(1, data.nbytes)
+            chunk_frames = max(1, min(self._chunk_frames, 2 ** 20 // frame_size))
+            dataset = group.create_dataset(name, shape=(0,) + data.shape, maxshape=(None,) + data.shape,
+                                           dtype=data.dtype, chunks=(chunk_frames,) + data.shape,
+                                           compression=self._compression)
+            timestamps = group.create_dataset(f'{name}_timestamps', shape=(0,), maxshape=(None,), dtype=float,
+                                              chunks=(max(chunk_frames, 64),))
+            self._buffers[key] = _ChannelBuffer(dataset, timestamps, chunk_frames)
+        return self._buffers[key]
+
+    def _write_loop(self, h5file: h5py.File):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                timestamp, frame = item
+                for det, dim, channel, data in frame:
+                    self._get_buffer(h5file, det, dim, channel, data).append(data, timestamp)
+                self.written += 1
+        except Exception as e:
+            self._failed(e)
+        finally:
+            # the file is closed whatever happens, even if the error came from a flush
+            for buffer in self._buffers.values():
+                try:
+                    buffer.flush()
+                except Exception as e:
+                    self._failed(e)
+            self._buffers = dict([])
+            try:
+                h5file.close()
+            except Exception as e:
+                self._failed(e)
+
+    def _failed(self, error: Exception):
+        """Log an error of the writer thread, the first one being kept in error"""
+        if self.error is None:
+            self.error = error
+        logger.exception(f'Error while saving data into {self.path}: {str(error)}')
@@ -1,3 +1,6 @@
+from datetime import datetime
+from pathlib import Path
+
 from pymodaq.utils import gui_utils as gutils
 from pymodaq.utils import daq_utils as utils
 from pyqtgraph.parametertree import Parameter, ParameterTree
@@ -7,6 +10,10 @@ from qtpy import QtWidgets, QtCore
 from pymodaq.utils.plotting.data_viewers.viewer1D import Viewer1D
 from pymodaq.utils.plotting.data_viewers.viewer2D import Viewer2D
 
+from pymodaq_plugins_teaching.extensions.h5_stream_writer import H5StreamWriter, COMPRESSIONS
+from pymodaq_plugins_teaching.extensions.render_scheduler import ChannelLayout, RenderScheduler
+from pymodaq_plugins_teaching.extensions.statistics import StatisticsStage, STAT_MODES
+
 
 config = utils.load_config()
 logger = utils.set_logger(utils.get_module_name(__file__))
@@ -22,9 +29,15 @@ class MyExtension(gutils.CustomApp):
             {'title': 'Save base path:', 'name': 'base_path', 'type': 'browsepath',
              'value': config['data_saving']['h5file']['save_path']},
             {'title': 'File name:', 'name': 'target_filename', 'type': 'str', 'value': "", 'readonly': True},
+            {'title': 'Save data:', 'name': 'save_data', 'type': 'bool', 'value': False,
+             'tip': 'stream the received data into a new HDF5 file in the base path'},
+            {'title': 'Compression:', 'name': 'compression', 'type': 'list', 'value': 'none',
+             'limits': COMPRESSIONS},
             {'title': 'Date:', 'name': 'date', 'type': 'date', 'value': QtCore.QDate.currentDate()},
             {'title': 'Do something, such as showing data:', 'name': 'do_something', 'type': 'bool', 'value': False},
             {'title': 'Something done:', 'name': 'something_done', 'type': 'led', 'value': False, 'readonly': True},
+            {'title': 'Max display rate (Hz):', 'name': 'max_fps', 'type': 'float', 'value': 20., 'min': 0.1,
+             'tip': 'data received faster are coalesced, only the latest being displayed'},
             {'title': 'Infos:', 'name': 'info', 'type': 'text', 'value': ""},
             {'title': 'push:', 'name': 'push', 'type': 'bool_push', 'value': False}
         ]},
@@ -35,15 +48,27 @@ class MyExtension(gutils.CustomApp):
              'limits': [0, 256, 512], 'tip': 'choose a stuff from this int list'},
             {'title': 'one integer:', 'name': 'an_integer', 'type': 'int', 'value': 500, },
             {'title': 'one float:', 'name': 'a_float', 'type': 'float', 'value': 2.7, },
+            {'title': 'Statistics:', 'name': 'stats_mode', 'type': 'list', 'value': 'none', 'limits': STAT_MODES,
+             'tip': 'running statistic displayed instead of the raw data'},
+            {'title': 'Statistics window:', 'name': 'stats_window', 'type': 'int', 'value': 0, 'min': 0,
+             'tip': 'number of frames after which the statistics restart (0: never), also sets the EMA decay'},
+            {'title': 'Reset statistics:', 'name': 'stats_reset', 'type': 'bool_push', 'value': False},
         ]},
     ]
 
     def __init__(self, dockarea, dashboard):
         super().__init__(dockarea, dashboard)
+        self.h5_writer: H5StreamWriter = None
+        self.channel_layout = ChannelLayout()
+        self.statistics = StatisticsStage(self.settings.child('other_settings', 'stats_mode').value(),
+                                          self.settings.child('other_settings', 'stats_window').value())
+        self.render_scheduler = RenderScheduler(self.render_data,
+                                                self.settings.child('main_settings', 'max_fps').value(), self)
         self.setup_ui()
 
     def connect_things(self):
-        pass
+        self.connect_action('quit', self.quit_fun)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.stop_saving)
 
     def setup_docks(self):
         """
@@ -115,6 +140,20 @@ class MyExtension(gutils.CustomApp):
                 self.modules_manager.det_done_signal.connect(self.show_data)
             else:
                 self.modules_manager.det_done_signal.disconnect()
+        elif param.name() == 'save_data':
+            if param.value():
+                self.start_saving()
+            else:
+                self.stop_saving()
+        elif param.name() == 'max_fps':
+            self.render_scheduler.max_fps = param.value()
+        elif param.name() == 'stats_mode':
+            self.statistics.mode = param.value()
+            self.statistics.reset()
+        elif param.name() == 'stats_window':
+            self.statistics.window = param.value()
+        elif param.name() == 'stats_reset':
+            self.statistics.reset()
 
     def param_deleted(self, param):
         ''' to be subclassed for actions to perform when one of the param in self.settings has been deleted
@@ -135,26 +174,64 @@ class MyExtension(gutils.CustomApp):
         raise NotImplementedError
 
     def setup_actions(self):
-        pass
+        self.add_action('quit', 'Quit', 'close2', 'Quit the extension, closing the file being saved')
+
+    def quit_fun(self):
+        """Close the file being saved, with all the data still queued, before closing the extension"""
+        self.stop_saving()
+        if self.mainwindow is not None:
+            self.mainwindow.close()
+
+    def start_saving(self):
+        """Create a new HDF5 file in the base path and stream the received data into it"""
+        self.stop_saving()
+        file_name = f"my_extension_{datetime.now().strftime('%Y%m%d_%H%M%S')}.h5"
+        self.h5_writer = H5StreamWriter(
+            Path(self.settings.child('main_settings', 'base_path').value()).joinpath(file_name),
+            compression=self.settings.child('main_settings', 'compression').value())
+        try:
+            self.h5_writer.start()
+        except Exception as e:
+            logger.exception(f'Could not create {self.h5_writer.path}: {str(e)}')
+            self.h5_writer.error = e
+            self.saving_failed()
+            return
+        self.settings.child('main_settings', 'target_filename').setValue(file_name)
+
+    def stop_saving(self):
+        """Write the data still queued and close the HDF5 file"""
+        if self.h5_writer is not None:
+            self.h5_writer.stop()
+            if self.h5_writer.dropped != 0:
+                logger.warning(f'{self.h5_writer.dropped} frames could not be saved into {self.h5_writer.path}')
+            self.h5_writer = None
+
+    def saving_failed(self):
+        """Report in the UI that the writer could not start or stopped on an error (already logged), and stop
+        saving"""
+        message = f'Saving into {self.h5_writer.path} stopped: {self.h5_writer.error}'
+        self.settings.child('main_settings', 'info').setValue(message)
+        self.log_signal.emit(message)
+        self.settings.child('main_settings', 'save_data').setValue(False)
+        self.stop_saving()
 
     def show_data(self, data_all):
-        data1D = []
-        data2D = []
-        labels1D = []
-        labels2D = []
-        dims = ['data1D', 'data2D']
-        for det in data_all:
-            for dim in dims:
-                if len(data_all[det][dim]) != 0:
-                    for channel in data_all[det][dim]:
-                        if dim == 'data1D':
-                            labels1D.append(channel)
-                            data1D.append(data_all[det][dim][channel]['data'])
-                        else:
-                            labels2D.append(channel)
-                            data2D.append(data_all[det][dim][channel]['data'])
-        self.viewer1D.show_data(data1D)
-        self.viewer2D.setImage(*data2D[:min(3, len(data2D))])
+        """Save the detectors data, update their statistics and schedule their display, throttled to the max
+        display rate"""
+        if self.h5_writer is not None:
+            if self.h5_writer.running:
+                self.h5_writer.submit(data_all)
+            else:
+                self.saving_failed()
+        self.render_scheduler.submit(self.statistics.process(data_all))
+
+    def render_data(self, data_all):
+        """Display the detectors data, only updating the viewers whose channels changed"""
+        data, changed = self.channel_layout.extract(data_all, force=self.statistics.enabled)
+        if changed['data1D']:
+            self.viewer1D.show_data(data['data1D'])
+        if changed['data2D']:
+            self.viewer2D.setImage(*data['data2D'][:min(3, len(data['data2D']))])
 
 
 
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+from time import perf_counter
+from typing import Callable, Tuple
+
+from qtpy import QtCore
+
+
+DIMS = ['data1D', 'data2D']
+
+
+class ChannelLayout:
+    """Cache of the channels layout of the det_done_signal data (detector -> dim -> channel -> {'data': ...})
+
+    The labels are only rebuilt when the set of detectors/channels changes, and the data of each dim is reported as
+    changed only if one of its arrays is not the one previously extracted
+    """
+
+    def __init__(self):
+        self._structure = None
+        self.labels = {dim: [] for dim in DIMS}
+        self._keys = {dim: [] for dim in DIMS}
+        self._last = {dim: [] for dim in DIMS}
+
+    def update(self, data_all: dict) -> bool:
+        """Update the layout from the data structure, returns True if it changed"""
+        structure = tuple((det, dim, tuple(data_all[det][dim].keys()))
+                          for det in data_all for dim in DIMS if len(data_all[det][dim]) != 0)
+        if structure == self._structure:
+            return False
+        self._structure = structure
+        self.labels = {dim: [] for dim in DIMS}
+        self._keys = {dim: [] for dim in DIMS}
+        self._last = {dim: [] for dim in DIMS}
+        for det, dim, channels in structure:
+            for channel in channels:
+                self.labels[dim].append(channel)
+                self._keys[dim].append((det, channel))
+        return True
+
+    def extract(self, data_all: dict, force: bool = False) -> Tuple[dict, dict]:
+        """Get the list of arrays of each dim and whether each dim changed since the last extraction
+
+        Parameters
+        ----------
+        data_all: dict
+            the det_done_signal data
+        force: bool
+            if True, each dim having channels is reported as changed, for data updated in place
+        """
+        self.update(data_all)
+        data = dict([])
+        changed = dict([])
+        for dim in DIMS:
+            data[dim] = [data_all[det][dim][channel]['data'] for det, channel in self._keys[dim]]
+            changed[dim] = (force and len(data[dim]) != 0) or len(data[dim]) != len(self._last[dim]) or \
+                any(array is not last for array, last in zip(data[dim], self._last[dim]))
+            self._last[dim] = data[dim]
+        return data, changed
+
+
+class RenderScheduler(QtCore.QObject):
+    """Throttle the rendering of incoming data to a maximum frame rate
+
+    Data submitted faster than max_fps are coalesced: only the latest is kept and rendered at the next render slot,
+    the others being counted as skipped. Must live in the GUI thread.
+
+    Parameters
+    ----------
+    render: callable
+        the function called with the data to render
+    max_fps: float
+        the maximum number of renderings per second
+    """
+
+    def __init__(self, render: Callable[[object], None], max_fps: float = 20., parent: QtCore.QObject = None):
+        super().__init__(parent)
+        self._render = render
+        self._pending = None
+        self._has_pending = False
+        self._last_render = - float('inf')
+        self.skipped = 0
+        self.rendered = 0
+        self.max_fps = max_fps
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def max_fps(self) -> float:
+        """Get/Set the maximum rendering rate in Hz"""
+        return self._max_fps
+
+    @max_fps.setter
+    def max_fps(self, value: float):
+        if value <= 0:
+            raise ValueError(f'A rendering rate of {value} is not possible. It should be strictly positive')
+        self._max_fps = value
+
+    def submit(self, data):
+        """Schedule the rendering of data, replacing any data still waiting to be rendered"""
+        if self._has_pending:
+            self.skipped += 1
+        self._pending = data
+        self._has_pending = True
+        if not self._timer.isActive():
+            delay = self._last_render + 1 / self._max_fps - perf_counter()
+            self._timer.start(int(max(0., delay) * 1000))
+
+    def flush(self):
+        """Render the pending data now, if any"""
+        self._timer.stop()
+        if self._has_pending:
+            data = self._pending
+            self._pending = None
+            self._has_pending = False
+            self._last_render = perf_counter()
+            self.rendered += 1
+            self._render(data)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+STAT_MODES = ['none', 'mean', 'variance', 'min', 'max', 'ema']
+
+
+class RunningStatistics:
+    """Running mean, variance, min, max and exponential moving average of a stream of arrays
+
+    The statistics are updated in place (Welford's algorithm for the mean and variance) into buffers allocated on the
+    first frame, so that no memory is allocated per frame whatever the number of frames
+
+    Parameters
+    ----------
+    window: int
+        number of frames after which the statistics (but the EMA) are restarted, 0 to accumulate forever. Also
+        defines the decay of the exponential moving average: alpha = 2 / (window + 1), the EMA being the cumulative
+        mean if 0
+    """
+
+    def __init__(self, window: int = 0):
+        if window < 0:
+            raise ValueError(f'A window of {window} frames is not possible. It should be positive')
+        self.window = window
+        self.count = 0
+        self._ema_count = 0
+        self._mean: np.ndarray = None
+
+    def reset(self):
+        """Restart the statistics from the next frame"""
+        self.count = 0
+        self._ema_count = 0
+
+    def _allocate(self, shape: Tuple[int, ...]):
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self._min = np.zeros(shape)
+        self._max = np.zeros(shape)
+        self._ema = np.zeros(shape)
+        self._variance = np.zeros(shape)
+        self._delta = np.zeros(shape)
+        self._delta2 = np.zeros(shape)
+
+    def update(self, data: np.ndarray):
+        """Add a frame to the statistics"""
+        if self._mean is None or self._mean.shape != np.shape(data):
+            self._allocate(np.shape(data))
+            self.reset()
+        if self.window > 0 and self.count >= self.window:
+            self.count = 0
+        self.count += 1
+        self._ema_count += 1
+        if self._ema_count == 1:
+            self._ema[...] = data
+        else:
+            alpha = 2 / (self.window + 1) if self.window > 0 else 1 / self._ema_count
+            np.subtract(data, self._ema, out=self._delta)
+            self._delta *= alpha
+            self._ema += self._delta
+        if self.count == 1:
+            self._mean[...] = data
+            self._m2[...] = 0.
+            self._min[...] = data
+            self._max[...] = data
+            return
+        np.subtract(data, self._mean, out=self._delta)
+        np.multiply(self._delta, 1 / self.count, out=self._delta2)
+        self._mean += self._delta2
+        np.subtract(data, self._mean, out=self._delta2)
+        self._delta2 *= self._delta
+        self._m2 += self._delta2
+        np.minimum(self._min, data, out=self._min)
+        np.maximum(self._max, data, out=self._max)
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self._mean
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Get the (unbiased) variance, zero until two frames have been accumulated"""
+        if self.count < 2:
+            self._variance[...] = 0.
+        else:
+            np.multiply(self._m2, 1 / (self.count - 1), out=self._variance)
+        return self._variance
+
+    @property
+    def min(self) -> np.ndarray:
+        return self._min
+
+    @property
+    def max(self) -> np.ndarray:
+        return self._max
+
+    @property
+    def ema(self) -> np.ndarray:
+        return self._ema
+
+    def get(self, mode: str) -> np.ndarray:
+        """Get one of the statistics by its name in STAT_MODES (except 'none')"""
+        return getattr(self, mode)
+
+
+class StatisticsStage:
+    """Processing stage replacing each channel data of the det_done_signal data by one of its running statistics
+
+    Parameters
+    ----------
+    mode: str
+        one of STAT_MODES, 'none' letting the data through untouched
+    window: int
+        see RunningStatistics
+    """
+
+    def __init__(self, mode: str = 'none', window: int = 0):
+        self._statistics: Dict[Tuple[str, str, str], RunningStatistics] = dict([])
+        self.mode = mode
+        self.window = window
+
+    @property
+    def enabled(self) -> bool:
+        return self._mode != 'none'
+
+    @property
+    def mode(self) -> str:
+        """Get/Set the statistic displayed instead of the data"""
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode: str):
+        if mode not in STAT_MODES:
+            raise ValueError(f'The statistics mode should be one of {STAT_MODES}, not {mode}')
+        self._mode = mode
+
+    @property
+    def window(self) -> int:
+        """Get/Set the statistics window in number of frames, restarting the statistics"""
+        return self._window
+
+    @window.setter
+    def window(self, window: int):
+        if window < 0:
+            raise ValueError(f'A window of {window} frames is not possible. It should be positive')
+        self._window = window
+        for statistics in self._statistics.values():
+            statistics.window = window
+            statistics.reset()
+
+    def reset(self):
+        """Restart all the statistics"""
+        for statistics in self._statistics.values():
+            statistics.reset()
+
+    def process(self, data_all: dict, dims=('data1D', 'data2D')) -> dict:
+        """Update the statistics of each channel and get the data with each channel replaced by its statistic"""
+        if not self.enabled:
+            return data_all
+        processed = dict([])
+        for det in data_all:
+            processed[det] = dict(data_all[det])
+            for dim in dims:
+                if dim not in data_all[det]:
+                    continue
+                processed[det][dim] = dict([])
+                for channel in data_all[det][dim]:
+                    key = (det, dim, channel)
+                    if key not in self._statistics:
+                        self._statistics[key] = RunningStatistics(self._window)
+                    statistics = self._statistics[key]
+                    statistics.update(data_all[det][dim][channel]['data'])
+                    processed[det][dim][channel] = dict(data_all[det][dim][channel])
+                    processed[det][dim][channel]['data'] = statistics.get(self._mode)
+        return processed
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import functools
+import numbers
+import threading
+from bisect import bisect_right
+from time import perf_counter
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from pymodaq.utils.logger import set_logger, get_module_name
+
+logger = set_logger(get_module_name(__file__))
+
+# upper edges (in s) of the latency histogram bins, four bins per decade from 1µs to 10s, the last bin being open
+LATENCY_EDGES: List[float] = [10 ** (exponent / 4) for exponent in range(-24, 5)]
+
+
+def _nbytes(result) -> int:
+    """Get the size of the data returned by a method: arrays, numbers and sequences of them, 0 for anything else"""
+    if hasattr(result, 'nbytes'):
+        return result.nbytes
+    if isinstance(result, numbers.Number):
+        return np.asarray(result).nbytes
+    if isinstance(result, (tuple, list)):
+        return sum(_nbytes(item) for item in result)
+    return 0
+
+
+class _MethodStats:
+    """Telemetry of a single instrumented method"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.
+        self.min = float('inf')
+        self.max = 0.
+        self.bytes = 0
+        self.histogram = [0] * (len(LATENCY_EDGES) + 1)
+
+    def record(self, latency: float, nbytes: int, error: bool):
+        self.count += 1
+        self.errors += error
+        self.total += latency
+        self.min = min(self.min, latency)
+        self.max = max(self.max, latency)
+        self.bytes += nbytes
+        self.histogram[bisect_right(LATENCY_EDGES, latency)] += 1
+
+    def snapshot(self) -> dict:
+        return dict(count=self.count, errors=self.errors, total=self.total,
+                    mean=self.total / self.count if self.count else 0.,
+                    min=self.min if self.count else 0., max=self.max, bytes=self.bytes,
+                    histogram=list(self.histogram))
+
+
+class Telemetry:
+    """Thread safe per method call counts, latency histograms and bytes produced
+
+    Parameters
+    ----------
+    name: str
+        the name under which the telemetry is logged
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._methods: Dict[str, _MethodStats] = {}
+        self._lock = threading.Lock()
+        self._log_stop = threading.Event()
+        self._log_thread: threading.Thread = None
+
+    def record(self, method: str, latency: float, result=None, error: bool = False):
+        """Record a call of an instrumented method: its latency and the size of its result, see _nbytes"""
+        nbytes = _nbytes(result)
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = _MethodStats()
+            stats.record(latency, nbytes, error)
+
+    def stats(self) -> Dict[str, dict]:
+        """Get a snapshot of the telemetry of each called method
+
+        Returns
+        -------
+        dict: mapping of the method names to dicts with keys count, errors, total, mean, min and max (in s), bytes
+            and histogram, the counts of calls per latency bin, see LATENCY_EDGES
+        """
+        with self._lock:
+            return {method: stats.snapshot() for method, stats in self._methods.items()}
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+
+    def start_logging(self, interval: float):
+        """Periodically log a summary of the telemetry through the package logger"""
+        if interval <= 0:
+            raise ValueError(f'A logging interval of {interval}s is not possible. It should be strictly positive')
+        self.stop_logging()
+        self._log_stop.clear()
+        self._log_thread = threading.Thread(target=self._log_periodically, args=(interval,), daemon=True)
+        self._log_thread.start()
+
+    def stop_logging(self):
+        if self._log_thread is not None:
+            self._log_stop.set()
+            self._log_thread.join()
+            self._log_thread = None
+
+    def _log_periodically(self, interval: float):
+        while not self._log_stop.wait(interval):
+            self.log()
+
+    def log(self):
+        """Log a one line summary per called method"""
+        for method, stats in self.stats().items():
+            logger.info(f"{self.name}.{method}: {stats['count']} calls ({stats['errors']} errors), "
+                        f"mean {stats['mean'] * 1000:.3f} ms, max {stats['max'] * 1000:.3f} ms, "
+                        f"{stats['bytes']} bytes")
+
+
+def instrumented(method: Callable) -> Callable:
+    """Decorate a method of an Instrumented driver so that its calls are recorded when instrumentation is enabled
+
+    When disabled, the only overhead is an attribute lookup.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        telemetry = self._telemetry
+        if telemetry is None:
+            return method(self, *args, **kwargs)
+        start = perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        except Exception:
+            telemetry.record(name, perf_counter() - start, error=True)
+            raise
+        telemetry.record(name, perf_counter() - start, result)
+        return result
+    return wrapper
+
+
+class Instrumented:
+    """Mixin giving per call telemetry of the methods decorated with instrumented, disabled by default"""
+
+    _telemetry: Telemetry = None
+
+    @property
+    def instrumentation_enabled(self) -> bool:
+        return self._telemetry is not None
+
+    def enable_instrumentation(self, log_interval: float = None):
+        """Start recording the calls of the instrumented methods
+
+        Parameters
+        ----------
+        log_interval: float, optional
+            if specified, a summary of the telemetry is logged every log_interval seconds
+        """
+        if self._telemetry is None:
+            self._telemetry = Telemetry(type(self).__name__)
+        if log_interval is not None:
+            self._telemetry.start_logging(log_interval)
+
+    def disable_instrumentation(self):
+        """Stop recording the calls, the recorded telemetry is discarded"""
+        if self._telemetry is not None:
+            self._telemetry.stop_logging()
+            self._telemetry = None
+
+    def stats(self) -> Dict[str, dict]:
+        """Get a snapshot of the telemetry of the instrumented methods, see Telemetry.stats"""
+        return {} if self._telemetry is None else self._telemetry.stats()
+
+    def reset_stats(self):
+        if self._telemetry is not None:
+            self._telemetry.reset()
@@ -4,10 +4,17 @@ Created the 08/11/2023
 
 @author: Sebastien Weber
 """
+import asyncio
+import threading
 import warnings
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, Iterator, List
 
+import numpy as np
+from pymodaq_plugins_teaching.hardware.instrumentation import Instrumented, instrumented
+from pymodaq_plugins_teaching.hardware.noise import NoiseGenerator
 from pymodaq_plugins_teaching.hardware.serial_addresses import SerialAddresses, BaseEnum
-import random
 from pylablib.core.devio import SCPI, interface
 from pylablib.devices.Keithley.multimeter import TGenericFunctionParameters
 
@@ -26,7 +33,113 @@ class Measurement(BaseEnum):
     freq_volt = 2
 
 
+class Session:
+    """ Shared handle on an instrument opened through the ResourceManager pool
+
+    Attributes of the instrument are reachable directly from the session, method calls being serialized by a lock
+    shared among all sessions on the same instrument. The session should be released once done, either explicitly or
+    using it as a context manager.
+    """
+
+    def __init__(self, manager: 'ResourceManager', address: str, instrument: 'Keithley2110', lock: threading.RLock):
+        self._manager = manager
+        self._address = address
+        self._instrument = instrument
+        self._lock = lock
+        self._released = False
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    @property
+    def instrument(self) -> 'Keithley2110':
+        """ Get the underlying instrument (not protected by the session lock)"""
+        return self._instrument
+
+    @property
+    def lock(self) -> threading.RLock:
+        """ Get the lock serializing the accesses to the instrument, to group several calls in one transaction"""
+        return self._lock
+
+    @property
+    def released(self) -> bool:
+        return self._released
+
+    def release(self):
+        """ Give back the session to the pool, the instrument stays open until evicted"""
+        self._manager.release(self)
+
+    def __getattr__(self, item):
+        if self._released:
+            raise IOError(f'The session on {self._address} has been released')
+        attribute = getattr(self._instrument, item)
+        if not callable(attribute):
+            return attribute
+
+        def locked_call(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+        return locked_call
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+class Configuration:
+    """ Pending configuration changes of a Keithley2110, see Keithley2110.configure
+
+    Unset attributes are left as they are on the device.
+    """
+    _FIELDS = ('function', 'rng', 'resolution', 'autorng')
+
+    def __init__(self, state: Dict[str, Any]):
+        self._state = state
+        self.changes: Dict[str, Any] = {}
+        self.sent: Dict[str, Any] = {}
+
+    def __getattr__(self, item):
+        if item in Configuration._FIELDS:
+            return self.changes.get(item, self._state[item])
+        raise AttributeError(f'No configuration called {item}')
+
+    def __setattr__(self, key, value):
+        if key in Configuration._FIELDS:
+            if key == 'function' and value not in Measurement.names():
+                raise ValueError(f'The requested measurement, {value} cannot be set')
+            self.changes[key] = value
+        else:
+            super().__setattr__(key, value)
+
+    def diff(self) -> Dict[str, Any]:
+        """ Get the changes differing from the device state"""
+        return {key: value for key, value in self.changes.items() if self._state[key] != value}
+
+
+class _PooledInstrument:
+    """ Entry of the ResourceManager pool"""
+
+    def __init__(self, instrument: 'Keithley2110'):
+        self.instrument = instrument
+        self.lock = threading.RLock()
+        self.ref_count = 0
+        self.eviction_timer: threading.Timer = None
+
+
 class ResourceManager:
+    """ Manager of the communication sessions with the instruments
+
+    Opened instruments are pooled and shared by all ResourceManager objects: acquiring an already opened address
+    returns a new handle on the same instrument without reopening it. Once the last handle on an instrument has
+    been released, the instrument is kept open for idle_timeout seconds before being closed.
+    """
+    idle_timeout = 10.
+
+    _pool: Dict[str, _PooledInstrument] = dict([])
+    _pool_lock = threading.Lock()
 
     def __init__(self):
         pass
@@ -35,8 +148,58 @@ class ResourceManager:
         """List all possible addresses"""
         return SerialAddresses.names()
 
-
-class Keithley2110:
+    def list_opened_resources(self) -> List[str]:
+        """List the addresses of the instruments currently opened in the pool"""
+        with self._pool_lock:
+            return list(self._pool.keys())
+
+    def acquire(self, address: str) -> Session:
+        """ Get a session on the instrument at the given address, opening it only if not already in the pool"""
+        with self._pool_lock:
+            entry = self._pool.get(address)
+            if entry is None:
+                entry = _PooledInstrument(Keithley2110(address))
+                self._pool[address] = entry
+            if entry.eviction_timer is not None:
+                entry.eviction_timer.cancel()
+                entry.eviction_timer = None
+            entry.ref_count += 1
+            return Session(self, address, entry.instrument, entry.lock)
+
+    def release(self, session: Session):
+        """ Give back a session, the instrument is evicted after idle_timeout once no session uses it anymore"""
+        with self._pool_lock:
+            if session.released:
+                return
+            session._released = True
+            entry = self._pool.get(session.address)
+            if entry is None or entry.instrument is not session.instrument:
+                return
+            entry.ref_count -= 1
+            if entry.ref_count <= 0:
+                entry.eviction_timer = threading.Timer(self.idle_timeout, self._evict, args=(session.address, entry))
+                entry.eviction_timer.daemon = True
+                entry.eviction_timer.start()
+
+    def _evict(self, address: str, entry: _PooledInstrument):
+        with self._pool_lock:
+            if self._pool.get(address) is entry and entry.ref_count <= 0:
+                del self._pool[address]
+                with entry.lock:
+                    entry.instrument.close()
+
+    def close_all(self):
+        """ Close all the pooled instruments, whether they are still in use or not"""
+        with self._pool_lock:
+            for entry in self._pool.values():
+                if entry.eviction_timer is not None:
+                    entry.eviction_timer.cancel()
+                with entry.lock:
+                    entry.instrument.close()
+            self._pool.clear()
+
+
+class Keithley2110(Instrumented):
     """ Python Driver object to communicate with a 2100 Series Keithley Digital Multimeter
 
     This is simulating a fake instrument but follows the PyLabLib driver structure
@@ -53,6 +216,11 @@ class Keithley2110:
         self._resolution: float = 1e-5
         self._auto: bool = True
         self._range: float = 0.1
+        self._sample_count: int = 1
+        self._state: Dict[str, Any] = None
+        self._round_trips = 0
+
+        self._noise_generator = NoiseGenerator.from_config()
 
         self._is_open = False
         if address is not None:
@@ -63,6 +231,16 @@ class Keithley2110:
         """ Get the communication status with the instrument"""
         return self._is_open
 
+    @property
+    def round_trips(self) -> int:
+        """ Get the number of configuration exchanges with the device (each a round trip with a real instrument)"""
+        return self._round_trips
+
+    @property
+    def noise_generator(self) -> NoiseGenerator:
+        """ Get the generator of the simulated readings, to seed it or change the noise model"""
+        return self._noise_generator
+
     def open_communication(self, address: str):
         """ Open a communication channel with the instrument using the serial address (USb, GPIB,...)"""
         if self.is_open:
@@ -72,18 +250,23 @@ class Keithley2110:
                 raise IOError('Invalid Address')
             else:
                 self._is_open = True
+                self._state = None
 
     def close(self):
         """ Close de communication channel"""
         if self._is_open:
             self._is_open = False
+        if self._telemetry is not None:
+            self._telemetry.stop_logging()
 
     def get_function(self, channel='primary'):
         """ Get the current measurement type"""
         if not self.is_open:
             raise TimeoutError
+        self._round_trips += 1
         return self.measurement.name
 
+    @instrumented
     def set_function(self, function: str, channel="primary", reset_secondary=True):
         """ Set a measurement type
 
@@ -97,18 +280,52 @@ class Keithley2110:
         if function not in Measurement.names():
             warnings.warn(f'The requested measurement, {function} cannot be set')
         else:
+            self._round_trips += 1
             self.measurement = Measurement[function]
+            if self._state is not None:
+                self._state['function'] = function
 
+    @instrumented
     def get_reading(self, channel='primary'):
         """ Grab the current reading from the device"""
         if not self.is_open:
             raise TimeoutError
-        return int(self._range * random.random() / self._resolution) * self._resolution
+        return int(self._range * self._noise_generator.draw_one() / self._resolution) * self._resolution
+
+    def get_sample_count(self) -> int:
+        """ Get the number of samples acquired per trigger (SCPI SAMP:COUN?)"""
+        if not self.is_open:
+            raise TimeoutError
+        return self._sample_count
+
+    def set_sample_count(self, n: int):
+        """ Set the number of samples acquired per trigger and stored in the reading buffer (SCPI SAMP:COUN)"""
+        if not self.is_open:
+            raise TimeoutError
+        if n < 1:
+            raise ValueError(f'The sample count should be strictly positive, not {n}')
+        self._sample_count = int(n)
+
+    @instrumented
+    def fetch_buffer(self, channel='primary') -> np.ndarray:
+        """ Get all the samples of the reading buffer in a single transaction (SCPI FETC?)
+
+        Returns
+        -------
+        ndarray: the sample count readings, quantized as get_reading
+        """
+        if not self.is_open:
+            raise TimeoutError
+        readings = self._noise_generator.draw(self._sample_count)
+        readings *= self._range / self._resolution
+        np.trunc(readings, out=readings)
+        readings *= self._resolution
+        return readings
 
     def reset(self):
         if not self.is_open:
             raise TimeoutError
-        pass
+        self._state = None
 
     def get_id(self):
         """ Get info about the connected device """
@@ -120,8 +337,10 @@ class Keithley2110:
         """ Get the parameters of the current measurement: range, resolution, autorange"""
         if not self.is_open:
             raise TimeoutError
+        self._round_trips += 1
         return TGenericFunctionParameters(self._range, self._resolution, self._auto)
 
+    @instrumented
     def set_function_parameters(self, function: str, **kwargs):
         """ Set the parameters of a given measurement
 
@@ -138,13 +357,113 @@ class Keithley2110:
         if not self.is_open:
             raise TimeoutError
         for kwarg in kwargs:
+            self._round_trips += 1
             if kwarg == 'rng':
                 self._range = kwargs[kwarg]
             elif kwarg == 'autorng':
                 self._auto = kwargs[kwarg]
             elif kwarg == 'resolution':
                 self._resolution = kwargs[kwarg]
-        return self.get_function_parameters(function)
+        parameters = self.get_function_parameters(function)
+        if self._state is not None:
+            self._state.update(parameters._asdict())
+        return parameters
+
+    def _read_state(self) -> Dict[str, Any]:
+        """ Read back the configuration of the device"""
+        function = self.get_function()
+        return dict(function=function, **self.get_function_parameters(function)._asdict())
+
+    @contextmanager
+    def configure(self) -> Iterator[Configuration]:
+        """ Change the function and its parameters in a single transaction
+
+        The changes are collected and only the ones differing from the cached device state are sent, all the
+        parameters in a single command, when leaving the context. The cached state is authoritative as long as the
+        device is only configured through this driver, so there is no readback, except for the first configuration
+        after opening or resetting the device. Nothing is sent if an exception is raised within the context.
+
+        Examples
+        --------
+        >>> with meter.configure() as cfg:
+        ...     cfg.function = 'curr_dc'
+        ...     cfg.rng = 1.
+        ...     cfg.autorng = False
+        """
+        if not self.is_open:
+            raise TimeoutError
+        if self._state is None:
+            self._state = self._read_state()
+        configuration = Configuration(dict(self._state))
+        yield configuration
+        diff = configuration.diff()
+        if 'function' in diff:
+            self._round_trips += 1
+            self.measurement = Measurement[diff['function']]
+        parameters = {key: value for key, value in diff.items() if key != 'function'}
+        if len(parameters) != 0:
+            self._round_trips += 1
+            self._range = parameters.get('rng', self._range)
+            self._resolution = parameters.get('resolution', self._resolution)
+            self._auto = parameters.get('autorng', self._auto)
+        self._state.update(diff)
+        configuration.sent = diff
+
+
+class AsyncKeithley2110:
+    """ Asyncio front-end of the Keithley2110 driver
+
+    Each call to the instrument is a transaction that can be given a simulated I/O latency (as a GPIB or USB round
+    trip). The latency is awaited without blocking the event loop so that many instruments can be polled concurrently.
+
+    Parameters
+    ----------
+    meter: Keithley2110
+        the driver to wrap, created (and connected if address is given) if None
+    address: str
+        the address to connect to when the meter has to be created
+    latency: float
+        the simulated duration in seconds of each transaction with the instrument
+    """
+
+    def __init__(self, meter: Keithley2110 = None, address: str = None, latency: float = 0.):
+        if meter is None:
+            meter = Keithley2110(address)
+        self.meter = meter
+        self.latency = latency
+
+    @property
+    def latency(self) -> float:
+        """Get/Set the simulated duration of a transaction with the instrument in seconds"""
+        return self._latency
+
+    @latency.setter
+    def latency(self, value: float):
+        if value < 0:
+            raise ValueError(f'A latency of {value} is not possible. It should be positive')
+        self._latency = value
+
+    async def _transaction(self, method, *args, **kwargs):
+        """ Simulate the I/O wait of a transaction then execute it"""
+        if self._latency > 0:
+            await asyncio.sleep(self._latency)
+        return method(*args, **kwargs)
+
+    async def get_reading(self, channel='primary') -> float:
+        """ Grab the current reading from the device"""
+        return await self._transaction(self.meter.get_reading, channel)
+
+    async def get_readings(self, n: int, channel='primary') -> List[float]:
+        """ Grab n successive readings from the device, one transaction each"""
+        return [await self.get_reading(channel) for _ in range(n)]
+
+    async def stream_readings(self, interval: float, channel='primary') -> AsyncIterator[float]:
+        """ Yield a reading every interval seconds (deadlines don't drift with the transaction latency)"""
+        deadline = perf_counter()
+        while True:
+            yield await self.get_reading(channel)
+            deadline += interval
+            await asyncio.sleep(max(0., deadline - perf_counter()))
 
 
 if __name__ == '__main__':
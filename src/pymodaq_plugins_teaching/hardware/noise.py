@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import itertools
+from typing import Tuple, Union
+
+import numpy as np
+
+from pymodaq_plugins_teaching import config as plugin_config
+from pymodaq_plugins_teaching.utils import Config
+
+
+NOISE_MODELS = ['uniform', 'gaussian', 'poisson']
+
+
+class NoiseGenerator:
+    """Seedable source of normalized noise samples for the mock instruments
+
+    Samples are generated by blocks with a numpy Generator and consumed chunk by chunk, which is much faster than
+    drawing a few samples per call.
+
+    Parameters
+    ----------
+    model: str
+        one of NOISE_MODELS: 'uniform' (in [0, 1)), 'gaussian' (zero mean, unit variance) or 'poisson' (shot noise
+        normalized to unit mean)
+    seed: int or SeedSequence, optional
+        the seed of the generator, None for a non reproducible one
+    block_size: int
+        the number of samples generated at once
+    poisson_lambda: float
+        the mean number of events of the poisson model
+    """
+
+    # stream numbers given to the generators created from the configuration, see from_config
+    _streams = itertools.count()
+
+    def __init__(self, model: str = 'uniform', seed: Union[int, np.random.SeedSequence] = None, block_size: int = 65536,
+                 poisson_lambda: float = 100.):
+        if block_size < 1:
+            raise ValueError(f'The block size should be strictly positive, not {block_size}')
+        if poisson_lambda <= 0:
+            raise ValueError(f'The poisson mean should be strictly positive, not {poisson_lambda}')
+        self._block_size = block_size
+        self._poisson_lambda = poisson_lambda
+        self._block = np.empty((0,))
+        self._position = 0
+        self.model = model
+        self.seed(seed)
+
+    @classmethod
+    def from_config(cls, config: Config = None, stream: int = None) -> 'NoiseGenerator':
+        """Create a generator from the noise section of the plugin configuration, a negative seed meaning no seed
+
+        With a seed, each generator draws from its own child stream of the seed so that the instruments do not all
+        produce the same noise. The streams are numbered by order of creation in the process, so a script creating
+        its instruments in the same order gets the same noise on each run.
+
+        Parameters
+        ----------
+        config: Config, optional
+            the configuration, by default the plugin one
+        stream: int, optional
+            the number of the child stream of the seed, by default the next one
+        """
+        if config is None:
+            config = plugin_config
+        if stream is None:
+            stream = next(cls._streams)
+        seed = config('noise', 'seed')
+        return cls(config('noise', 'model'), None if seed < 0 else np.random.SeedSequence(seed, spawn_key=(stream,)),
+                   config('noise', 'block_size'), config('noise', 'poisson_lambda'))
+
+    @property
+    def model(self) -> str:
+        """Get/Set the noise model"""
+        return self._model
+
+    @model.setter
+    def model(self, model: str):
+        if model not in NOISE_MODELS:
+            raise ValueError(f'The noise model should be one of {NOISE_MODELS}, not {model}')
+        self._model = model
+        self._flush()
+
+    def seed(self, seed: Union[int, np.random.SeedSequence] = None):
+        """(Re)seed the generator, discarding the samples already generated"""
+        self._rng = np.random.default_rng(seed)
+        self._flush()
+
+    def _flush(self):
+        self._position = len(self._block)
+
+    def _generate(self, size: int) -> np.ndarray:
+        if self._model == 'uniform':
+            return self._rng.random(size)
+        elif self._model == 'gaussian':
+            return self._rng.standard_normal(size)
+        else:
+            return self._rng.poisson(self._poisson_lambda, size) / self._poisson_lambda
+
+    def draw(self, shape: Union[int, Tuple[int, ...]], out: np.ndarray = None) -> np.ndarray:
+        """Get noise samples
+
+        Parameters
+        ----------
+        shape: int or tuple of int
+            the shape of the returned array, ignored if out is given
+        out: ndarray, optional
+            a preallocated contiguous float array to fill with the samples
+
+        Returns
+        -------
+        ndarray
+        """
+        if out is None:
+            out = np.empty(shape)
+        elif not out.flags.c_contiguous:
+            raise ValueError('The output array should be contiguous')
+        flat = out.reshape(-1)
+        filled = 0
+        while filled < flat.size:
+            if self._position >= len(self._block):
+                self._block = self._generate(max(self._block_size, flat.size - filled))
+                self._position = 0
+            chunk = min(flat.size - filled, len(self._block) - self._position)
+            flat[filled:filled + chunk] = self._block[self._position:self._position + chunk]
+            self._position += chunk
+            filled += chunk
+        return out
+
+    def draw_one(self) -> float:
+        """Get a single noise sample"""
+        if self._position >= len(self._block):
+            self._block = self._generate(self._block_size)
+            self._position = 0
+        value = self._block[self._position]
+        self._position += 1
+        return float(value)
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+from typing import Iterable, NamedTuple, Sequence, Union
+
+import numpy as np
+
+
+PEAK_SHAPES = ['gauss', 'lorentz', 'voigt']
+
+
+class Peak(NamedTuple):
+    """A spectral line
+
+    The width has the meaning of the dx parameter of pymodaq's gauss1D for all shapes, so that changing the shape of a
+    peak keeps its width at half maximum. The voigt shape is approximated by a pseudo-voigt profile: eta * lorentz +
+    (1 - eta) * gauss
+    """
+    center: float
+    width: float
+    amplitude: float
+    shape: str = 'gauss'
+    eta: float = 0.5
+
+
+class PeakSet:
+    """A set of spectral lines stored as arrays to be evaluated in a single broadcasted operation
+
+    Parameters
+    ----------
+    peaks: iterable of Peak or of tuples with the Peak fields
+    background: float or sequence of float
+        the coefficients (highest degree first, as numpy.polyval) of a polynomial background in wavelength
+    """
+
+    def __init__(self, peaks: Iterable[Union[Peak, tuple]], background: Union[float, Sequence[float]] = 0.):
+        self.peaks = [Peak(*peak) for peak in peaks]
+        for peak in self.peaks:
+            if peak.width <= 0:
+                raise ValueError(f'The width of the peak {peak} should be strictly positive')
+            if peak.shape not in PEAK_SHAPES:
+                raise ValueError(f'The shape of the peak {peak} should be one of {PEAK_SHAPES}')
+        self.background = np.atleast_1d(np.asarray(background, dtype=float))
+
+        self._centers = np.array([peak.center for peak in self.peaks], dtype=float)[:, np.newaxis]
+        self._widths = np.array([peak.width for peak in self.peaks], dtype=float)[:, np.newaxis]
+        self._amplitudes = np.array([peak.amplitude for peak in self.peaks], dtype=float)
+        self._etas = np.array([0. if peak.shape == 'gauss' else 1. if peak.shape == 'lorentz' else peak.eta
+                               for peak in self.peaks])[:, np.newaxis]
+
+    def __len__(self):
+        return len(self.peaks)
+
+    def __call__(self, axis: np.ndarray) -> np.ndarray:
+        """Evaluate the sum of the peaks and of the background over the axis"""
+        axis = np.asarray(axis, dtype=float)
+        data = np.polyval(self.background, axis)
+        if len(self.peaks) == 0:
+            return data
+        reduced = (axis[np.newaxis, :] - self._centers) / self._widths
+        reduced **= 2
+        profiles = np.zeros(reduced.shape)
+        if np.any(self._etas < 1.):
+            profiles += (1 - self._etas) * np.exp(-2 * np.log(2) * reduced)
+        if np.any(self._etas > 0.):
+            profiles += self._etas / (1 + 2 * reduced)
+        data += self._amplitudes @ profiles
+        return data
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple
+
+import numpy as np
+
+# acquisition method called on a device when none is specified, by order of preference
+ACQUISITION_METHODS = ['grab_spectrum', 'get_reading']
+
+
+class DeviceReading(NamedTuple):
+    """Data acquired by a device upon a trigger, with the perf_counter times at which its acquisition started and
+    stopped"""
+    data: Any
+    start: float
+    stop: float
+
+    @property
+    def timestamp(self) -> float:
+        """Get the time of the acquisition, its midpoint"""
+        return (self.start + self.stop) / 2
+
+
+class TriggerResult(NamedTuple):
+    """Readings of all the devices upon a single trigger"""
+    index: int
+    readings: Dict[str, DeviceReading]
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {name: reading.data for name, reading in self.readings.items()}
+
+    @property
+    def timestamps(self) -> Dict[str, float]:
+        return {name: reading.timestamp for name, reading in self.readings.items()}
+
+    @property
+    def timestamp(self) -> float:
+        """Get the time of the trigger, the mean of the devices timestamps"""
+        return sum(self.timestamps.values()) / len(self.readings)
+
+    @property
+    def start_skew(self) -> float:
+        """Get the spread of the acquisition start times over the devices"""
+        starts = [reading.start for reading in self.readings.values()]
+        return max(starts) - min(starts)
+
+    @property
+    def skew(self) -> float:
+        """Get the spread of the devices timestamps"""
+        timestamps = self.timestamps.values()
+        return max(timestamps) - min(timestamps)
+
+    @property
+    def duration(self) -> float:
+        """Get the time from the first acquisition start to the last acquisition stop"""
+        return (max(reading.stop for reading in self.readings.values()) -
+                min(reading.start for reading in self.readings.values()))
+
+    def stack(self, names: List[str] = None) -> np.ndarray:
+        """Stack the data of some devices (all by default) along a new first axis
+
+        The stacked data should share the same shape, for instance the spectra of identical spectrometers or the
+        readings of multimeters.
+        """
+        if names is None:
+            names = list(self.readings)
+        return np.stack([np.asarray(self.readings[name].data) for name in names])
+
+
+class ParallelScheduler:
+    """Trigger several devices together on a thread pool and gather their data
+
+    Upon each trigger, all the devices start their acquisition at the same time (released together from a barrier)
+    so that a trigger lasts as long as the slowest device instead of the sum of all the device latencies. This holds
+    for real drivers, which release the GIL while blocked on their I/O. The pure Python mocks of this package mostly
+    hold the GIL, so they only overlap where they sleep or call into numpy.
+
+    The skew statistics are accumulated on the fly (Welford's algorithm) so that long runs use a constant memory.
+
+    Parameters
+    ----------
+    devices: dict
+        mapping of the device names to the devices (Spectrometer, Keithley2110...) or to acquisition callables
+    """
+
+    def __init__(self, devices: Dict[str, Any] = None):
+        self._acquisitions: Dict[str, Callable] = {}
+        self._executor: ThreadPoolExecutor = None
+        self._triggered = 0
+        self._skew_count = 0
+        self._skew_mean = 0.
+        self._skew_m2 = 0.
+        self._skew_max = 0.
+        if devices is not None:
+            for name, device in devices.items():
+                self.add(name, device)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._acquisitions)
+
+    @property
+    def triggered(self) -> int:
+        """Get the number of triggers done so far"""
+        return self._triggered
+
+    def add(self, name: str, device, *args, method: str = None, **kwargs):
+        """Add a device to be triggered
+
+        Parameters
+        ----------
+        name: str
+            the unique name of the device in the results
+        device: object or callable
+            the device, or directly the callable doing the acquisition
+        args, kwargs:
+            the arguments of the acquisition method
+        method: str, optional
+            keyword only, the name of the acquisition method of the device, by default the first of
+            ACQUISITION_METHODS the device has
+        """
+        if name in self._acquisitions:
+            raise KeyError(f'A device called {name} is already scheduled')
+        if method is None:
+            method = next((method for method in ACQUISITION_METHODS if hasattr(device, method)), None)
+        if method is not None:
+            acquisition = getattr(device, method)
+        elif callable(device):
+            acquisition = device
+        else:
+            raise TypeError(f'No acquisition method found for {device}')
+        self._acquisitions[name] = lambda: acquisition(*args, **kwargs)
+        self._shutdown_executor()
+
+    def remove(self, name: str):
+        self._acquisitions.pop(name)
+        self._shutdown_executor()
+
+    def _shutdown_executor(self):
+        """The pool is sized on the number of devices, so it is created again when they change"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _acquire(self, acquisition: Callable, barrier: threading.Barrier) -> DeviceReading:
+        barrier.wait()
+        start = perf_counter()
+        data = acquisition()
+        return DeviceReading(data, start, perf_counter())
+
+    def trigger(self) -> TriggerResult:
+        """Trigger all the devices together and wait for all their data
+
+        If some acquisitions fail, the first exception is raised once all the devices are done.
+        """
+        if len(self._acquisitions) == 0:
+            raise ValueError('No device to trigger')
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(len(self._acquisitions), thread_name_prefix='trigger')
+        barrier = threading.Barrier(len(self._acquisitions))
+        futures = {name: self._executor.submit(self._acquire, acquisition, barrier)
+                   for name, acquisition in self._acquisitions.items()}
+        errors = [future.exception() for future in futures.values()]
+        for error in errors:
+            if error is not None:
+                raise error
+        result = TriggerResult(self._triggered, {name: future.result() for name, future in futures.items()})
+        self._triggered += 1
+        self._update_skew_stats(result.skew)
+        return result
+
+    def _update_skew_stats(self, skew: float):
+        self._skew_count += 1
+        delta = skew - self._skew_mean
+        self._skew_mean += delta / self._skew_count
+        self._skew_m2 += delta * (skew - self._skew_mean)
+        self._skew_max = max(self._skew_max, skew)
+
+    def triggers(self, n: int) -> Iterator[TriggerResult]:
+        """Trigger all the devices n times in a row, yielding each result"""
+        for _ in range(n):
+            yield self.trigger()
+
+    def skew_stats(self) -> Dict[str, float]:
+        """Get the statistics of the devices timestamps spread over all the triggers done so far
+
+        Returns
+        -------
+        dict: with keys count, mean, std and max (in s)
+        """
+        if self._skew_count == 0:
+            return dict(count=0, mean=0., std=0., max=0.)
+        return dict(count=self._skew_count, mean=self._skew_mean, std=math.sqrt(self._skew_m2 / self._skew_count),
+                    max=self._skew_max)
+
+    def close(self):
+        self._shutdown_executor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+from numbers import Integral
+from typing import Tuple, Union
+
+import numpy as np
+
+
+class SeparableImage:
+    """Lazy rank-1 image, stored as the two factors of the outer product column x row
+
+    Slicing, sums and projections are computed on the factors in O(Ny + Nx), the image is only materialized when
+    converted into an array (np.asarray). Sums are computed on the float factors, before any conversion to an
+    integer dtype.
+
+    Parameters
+    ----------
+    column: ndarray
+        the vertical factor of length Ny
+    row: ndarray
+        the horizontal factor of length Nx
+    dtype: dtype
+        the data type of the materialized image
+    """
+
+    def __init__(self, column: np.ndarray, row: np.ndarray, dtype=np.float64):
+        self._column = np.asarray(column)
+        self._row = np.asarray(row)
+        if self._column.ndim != 1 or self._row.ndim != 1:
+            raise ValueError('The factors of a separable image should be one dimensional')
+        self._dtype = np.dtype(dtype)
+
+    def __repr__(self):
+        return f'SeparableImage of shape {self.shape} and dtype {self.dtype}'
+
+    @property
+    def column(self) -> np.ndarray:
+        return self._column
+
+    @property
+    def row(self) -> np.ndarray:
+        return self._row
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self._column), len(self._row)
+
+    @property
+    def ndim(self) -> int:
+        return 2
+
+    @property
+    def size(self) -> int:
+        return len(self._column) * len(self._row)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    @property
+    def nbytes(self) -> int:
+        """Get the bytes held by the factors, not the size of the materialized image (size * dtype.itemsize)"""
+        return self._column.nbytes + self._row.nbytes
+
+    def __len__(self):
+        return len(self._column)
+
+    @property
+    def T(self) -> 'SeparableImage':
+        return SeparableImage(self._row, self._column, self._dtype)
+
+    def __array__(self, dtype=None, copy=None):
+        data = np.outer(self._column, self._row)
+        if np.issubdtype(self._dtype, np.integer):
+            info = np.iinfo(self._dtype)
+            np.rint(data, out=data)
+            np.clip(data, info.min, info.max, out=data)
+        return data.astype(self._dtype if dtype is None else dtype, copy=False)
+
+    def toarray(self) -> np.ndarray:
+        """Materialize the image"""
+        return np.asarray(self)
+
+    def __getitem__(self, item) -> Union['SeparableImage', np.ndarray, float]:
+        if not isinstance(item, tuple):
+            item = (item,)
+        if len(item) > 2:
+            raise IndexError(f'Too many indices for a 2D image: {item}')
+        item = item + (slice(None),) * (2 - len(item))
+        column = self._column[item[0]]
+        row = self._row[item[1]]
+        if isinstance(item[0], Integral) and isinstance(item[1], Integral):
+            return np.asarray(SeparableImage(column[None], row[None], self._dtype))[0, 0]
+        elif isinstance(item[0], Integral):
+            return np.asarray(SeparableImage(column[None], row, self._dtype))[0]
+        elif isinstance(item[1], Integral):
+            return np.asarray(SeparableImage(column, row[None], self._dtype))[:, 0]
+        return SeparableImage(column, row, self._dtype)
+
+    def sum(self, axis: int = None) -> Union[np.ndarray, float]:
+        """Sum the image, along an axis (projection) or over all pixels if axis is None"""
+        if axis is None:
+            return float(self._column.sum() * self._row.sum())
+        elif axis in (0, -2):
+            return self._column.sum() * self._row
+        elif axis in (1, -1):
+            return self._row.sum() * self._column
+        raise ValueError(f'Invalid axis {axis} for a 2D image')
+
+    def mean(self, axis: int = None) -> Union[np.ndarray, float]:
+        """Average the image, along an axis or over all pixels if axis is None"""
+        if axis is None:
+            return self.sum() / self.size
+        return self.sum(axis) / self.shape[axis]
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import os
+import sys
+from multiprocessing import shared_memory, resource_tracker
+from time import perf_counter, sleep
+from typing import Optional, Tuple
+
+import numpy as np
+
+from pymodaq_plugins_teaching.hardware.streaming import Frame
+
+# the blocks are registered to the resource tracker when attached to, up to python 3.12 and on posix only
+_TRACKED_ATTACH = sys.version_info < (3, 13) and os.name == 'posix'
+
+# polling period when reading a slot being written
+_POLL_PERIOD = 1e-4
+
+
+def _tracker_id() -> Tuple[int, int]:
+    """Identify the resource tracker of this process by its pipe, shared with the processes this one spawned"""
+    stat = os.fstat(resource_tracker.getfd())
+    return stat.st_dev, stat.st_ino
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    return shared_memory.SharedMemory(name)
+
+
+class SharedFrameRing:
+    """Ring of frames stored in a named shared memory block, to transport frames between processes without pickling
+
+    The block starts with a small header (geometry, data type, number of written frames and resource tracker of the
+    producer) followed, for each slot, by the frame id, its timestamp and a sequence counter guarding against reading
+    a slot being written. A single producer creates the ring, any number of consumers attach to it by name.
+
+    Parameters
+    ----------
+    name: str
+        the name of the shared memory block
+    shape: tuple of int
+        the shape of a frame, only used when creating the ring
+    dtype: str or dtype
+        the data type of the frames, only used when creating the ring
+    depth: int
+        the number of frames the ring can hold, only used when creating the ring
+    create: bool
+        True to create the ring (producer side), False to attach to an existing one (consumer side)
+    """
+    _MAGIC = 0x50594d4f44415131
+    _MAX_DIM = 4
+    _META_SIZE = 8 + _MAX_DIM
+    _DTYPE_SIZE = 16
+    _SLOT_HEADER = np.dtype([('frame_id', '<i8'), ('timestamp', '<f8'), ('sequence', '<i8')])
+
+    def __init__(self, name: str, shape: Tuple[int, ...] = None, dtype='float64', depth: int = 8,
+                 create: bool = False):
+        self._owner = create
+        if create:
+            if shape is None or len(shape) > self._MAX_DIM:
+                raise ValueError(f'A frame shape with at most {self._MAX_DIM} dimensions should be given')
+            if depth < 1:
+                raise ValueError(f'The depth of the ring should be strictly positive, not {depth}')
+            dtype = np.dtype(dtype)
+            shape = tuple(int(size) for size in shape)
+            self._shm = shared_memory.SharedMemory(name, create=True,
+                                                   size=self._data_offset(depth) +
+                                                   depth * int(np.prod(shape)) * dtype.itemsize)
+            self._meta = np.ndarray((self._META_SIZE,), '<i8', self._shm.buf)
+            self._meta[:] = 0
+            self._meta[:4] = self._MAGIC, depth, len(shape), 0
+            if _TRACKED_ATTACH:
+                self._meta[4:6] = _tracker_id()
+            self._meta[8:8 + len(shape)] = shape
+            self._dtype_field()[:] = np.frombuffer(dtype.str.encode().ljust(self._DTYPE_SIZE), np.uint8)
+        else:
+            self._shm = _attach(name)
+            self._meta = np.ndarray((self._META_SIZE,), '<i8', self._shm.buf)
+            is_ring = self._meta[0] == self._MAGIC
+            self._untrack(is_ring)
+            if not is_ring:
+                self._meta = None
+                self._shm.close()
+                raise IOError(f'The shared memory block {name} is not a frame ring')
+            depth, ndim = int(self._meta[1]), int(self._meta[2])
+            shape = tuple(int(size) for size in self._meta[8:8 + ndim])
+            dtype = np.dtype(bytes(self._dtype_field()).rstrip().decode())
+        self._depth = depth
+        self._headers = np.ndarray((depth,), self._SLOT_HEADER, self._shm.buf, self._header_offset())
+        self._frames = np.ndarray((depth,) + shape, dtype, self._shm.buf, self._data_offset(depth))
+        if create:
+            self._headers['frame_id'] = -1
+            self._headers['sequence'] = 0
+
+    def _untrack(self, is_ring: bool):
+        """Remove the registration of an attached block from the resource tracker, which would otherwise destroy it
+        when this (consumer) process exits
+
+        A process spawned by the producer shares its tracker, which holds a single registration per block: it is
+        left as is so that the producer can still unregister the block when destroying it.
+        """
+        if _TRACKED_ATTACH and not (is_ring and tuple(self._meta[4:6]) == _tracker_id()):
+            resource_tracker.unregister(self._shm._name, 'shared_memory')
+
+    def _dtype_field(self) -> np.ndarray:
+        return np.ndarray((self._DTYPE_SIZE,), np.uint8, self._shm.buf, self._META_SIZE * 8)
+
+    def _header_offset(self) -> int:
+        return self._META_SIZE * 8 + self._DTYPE_SIZE
+
+    def _data_offset(self, depth: int) -> int:
+        offset = self._header_offset() + depth * self._SLOT_HEADER.itemsize
+        return (offset + 63) // 64 * 64
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Get the shape of a frame"""
+        return self._frames.shape[1:]
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._frames.dtype
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @property
+    def produced(self) -> int:
+        """Get the total number of frames written into the ring"""
+        return int(self._meta[3])
+
+    def write(self, data: np.ndarray, timestamp: float = None) -> int:
+        """Copy a frame into the next slot of the ring (producer side)
+
+        Returns
+        -------
+        int: the id of the written frame
+        """
+        if timestamp is None:
+            timestamp = perf_counter()
+        frame_id = int(self._meta[3])
+        slot = frame_id % self._depth
+        header = self._headers[slot:slot + 1]
+        header['sequence'] += 1  # odd: being written
+        try:
+            self._frames[slot] = data
+        except BaseException:
+            header['frame_id'] = -1  # the slot content is garbage
+            raise
+        else:
+            header['frame_id'] = frame_id
+            header['timestamp'] = timestamp
+        finally:
+            header['sequence'] += 1
+        self._meta[3] = frame_id + 1
+        return frame_id
+
+    def read(self, frame_id: int, copy: bool = True, timeout: float = 1.) -> Optional[Frame]:
+        """Get a given frame (consumer side)
+
+        Parameters
+        ----------
+        frame_id: int
+            the id of the frame to read
+        copy: bool
+            if False, the frame data is a view on the shared memory, valid until the slot is overwritten
+        timeout: float
+            the maximum time in s to wait for a slot being written, for instance by a producer which died meanwhile
+
+        Returns
+        -------
+        Frame or None if the frame is not in the ring (not yet written or already overwritten)
+        """
+        slot = frame_id % self._depth
+        deadline = perf_counter() + timeout
+        while True:
+            sequence = int(self._headers['sequence'][slot])
+            if sequence % 2 == 1:
+                if perf_counter() > deadline:
+                    raise TimeoutError(f'The slot of frame {frame_id} has been being written for more than '
+                                       f'{timeout}s')
+                sleep(_POLL_PERIOD)
+                continue
+            if int(self._headers['frame_id'][slot]) != frame_id:
+                return None
+            timestamp = float(self._headers['timestamp'][slot])
+            data = self._frames[slot].copy() if copy else self._frames[slot]
+            if int(self._headers['sequence'][slot]) == sequence:
+                return Frame(frame_id, timestamp, data)
+
+    def latest(self, copy: bool = True, timeout: float = 1.) -> Optional[Frame]:
+        """Get the most recent frame, None if no frame has been written yet or if the write of the most recent one
+        failed"""
+        while True:
+            produced = self.produced
+            if produced == 0:
+                return None
+            frame = self.read(produced - 1, copy, timeout)
+            # a missing frame is only retried if it has been overwritten meanwhile
+            if frame is not None or self.produced == produced:
+                return frame
+
+    def close(self):
+        """Detach from the shared memory block, which is also destroyed if this ring created it"""
+        self._headers = None
+        self._frames = None
+        self._meta = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+            self._owner = False
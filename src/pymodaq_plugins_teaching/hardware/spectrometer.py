@@ -1,20 +1,35 @@
 import numpy as np
 from pymodaq.utils.math_utils import gauss1D
-from typing import List, Union
+from typing import List, Tuple, Union
 from collections.abc import Iterable
 from numbers import Number
 import math
+import threading
+from pathlib import Path
 from time import perf_counter
 
+from pymodaq.utils.logger import set_logger, get_module_name
 
-class Spectrometer:
+from pymodaq_plugins_teaching import config
+from pymodaq_plugins_teaching.hardware.instrumentation import Instrumented, instrumented
+from pymodaq_plugins_teaching.hardware.noise import NoiseGenerator
+from pymodaq_plugins_teaching.hardware.peaks import Peak, PeakSet
+from pymodaq_plugins_teaching.hardware.separable import SeparableImage
+from pymodaq_plugins_teaching.hardware.shared_frames import SharedFrameRing
+from pymodaq_plugins_teaching.hardware.streaming import FrameRing, Frame
+from pymodaq_plugins_teaching.hardware.timing import ClockAborted, FrameClock
+
+logger = set_logger(get_module_name(__file__))
+
+
+class Spectrometer(Instrumented):
     """Mock Controller of a spectrometer
 
     Allows to change the used grating, to move the grating by setting the central wavelength and get the data out of it
     """
     gratings = ['G300', 'G1200']
+    dtypes = ['uint16', 'float32', 'float64']
 
-    Nx = 256
     infos = 'Spectrometer Controller Wrapper 0.1.0'
 
     def __init__(self):
@@ -36,15 +51,57 @@ class Spectrometer:
         self._target_lambda = self._lambda
 
         self._lambda0 = 528
+        self._peaks: PeakSet = None
+        self._background = np.zeros((1,))
+
+        self._Nx = 256
+        self._Ny = 128
+        self._binning = 1
+        self._roi: Tuple[int, int, int, int] = None
+        self._dtype = np.dtype('float64')
+        self._adc_gain = 1.
+
+        self._motion_changed = threading.Condition()
+
+        self._cache = {}
+
+        self._noise_generator = NoiseGenerator.from_config()
+
+        self._stream: FrameRing = None
+        self._stream_thread: threading.Thread = None
+        self._stream_stop = threading.Event()
+        self._shared_stream: SharedFrameRing = None
+        self._stream_error: Exception = None
+
+        self._replay = None
+        self._replay_file = None
+        self._replay_rate: float = None
+        self._replay_loop = True
+        self._replay_index = 0
+        self._replay_start = 0.
+
+        self._clock: FrameClock = FrameClock.from_config() if config('timing', 'enabled') else None
+
+        self.Nx = config('spectrometer', 'Nx')
+        self.Ny = config('spectrometer', 'Ny')
+        self.binning = config('spectrometer', 'binning')
+        self.dtype = config('spectrometer', 'dtype')
+        self.adc_gain = config('spectrometer', 'adc_gain')
 
     def open_communication(self):
         return True
 
     def close_communication(self):
+        self.stop_stream()
+        self.stop_replay()
+        if self._telemetry is not None:
+            self._telemetry.stop_logging()
         return True
 
     def stop(self):
         self._moving = False
+        with self._motion_changed:
+            self._motion_changed.notify_all()
 
     @property
     def tau(self):
@@ -79,6 +136,7 @@ class Spectrometer:
     def grating(self, grat):
         if grat in self.gratings:
             self._grating = grat
+            self._invalidate_cache()
 
     @property
     def amplitude(self):
@@ -91,6 +149,7 @@ class Spectrometer:
             self._amp = value
         if value > 100:
             self._amp = 100
+        self._invalidate_cache()
 
     @property
     def noise(self):
@@ -102,6 +161,11 @@ class Spectrometer:
         if value > 0.:
             self._noise = value
 
+    @property
+    def noise_generator(self) -> NoiseGenerator:
+        """Get the generator of the noise samples, to seed it or change the noise model"""
+        return self._noise_generator
+
     @property
     def width(self):
         """Get/Set the width of the measured spectrum main peak"""
@@ -111,11 +175,113 @@ class Spectrometer:
     def width(self, value):
         if value > 0.:
             self._wh = value
+            self._invalidate_cache()
+
+    @property
+    def Nx(self) -> int:
+        """Get/Set the number of pixels of the sensor along the wavelength axis, resetting the ROI"""
+        return self._Nx
+
+    @Nx.setter
+    def Nx(self, value: int):
+        if value < 1:
+            raise ValueError(f'The number of pixels should be strictly positive, not {value}')
+        self._Nx = int(value)
+        self._roi = None
+        self._invalidate_cache()
+
+    @property
+    def Ny(self) -> int:
+        """Get/Set the number of rows of the sensor, resetting the ROI and the binning"""
+        return self._Ny
+
+    @Ny.setter
+    def Ny(self, value: int):
+        if value < 1:
+            raise ValueError(f'The number of rows should be strictly positive, not {value}')
+        self._Ny = int(value)
+        self._roi = None
+        self._binning = 1
+        self._invalidate_cache()
+
+    @property
+    def binning(self) -> int:
+        """Get/Set the number of adjacent rows summed together by the sensor (vertical binning)"""
+        return self._binning
+
+    @binning.setter
+    def binning(self, value: int):
+        if value < 1 or value > self.roi[3] - self.roi[2]:
+            raise ValueError(f'A binning of {value} is not possible. It should be between 1 and the ROI height')
+        self._binning = int(value)
+        self._invalidate_cache()
+
+    @property
+    def roi(self) -> Tuple[int, int, int, int]:
+        """Get/Set the region of interest of the sensor as (x_start, x_stop, y_start, y_stop), None for the full
+        sensor. Pixels outside the ROI are never computed"""
+        if self._roi is None:
+            return 0, self._Nx, 0, self._Ny
+        return self._roi
+
+    @roi.setter
+    def roi(self, roi: Tuple[int, int, int, int]):
+        if roi is not None:
+            x_start, x_stop, y_start, y_stop = [int(bound) for bound in roi]
+            if not (0 <= x_start < x_stop <= self._Nx and 0 <= y_start < y_stop <= self._Ny):
+                raise ValueError(f'The ROI {roi} is not within the {self._Nx}x{self._Ny} sensor')
+            if y_stop - y_start < self._binning:
+                raise ValueError(f'The ROI {roi} is smaller than the binning of {self._binning} rows')
+            roi = x_start, x_stop, y_start, y_stop
+        self._roi = roi
+        self._invalidate_cache()
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Get/Set the data type of the grabbed data, one of the dtypes attribute"""
+        return self._dtype
+
+    @dtype.setter
+    def dtype(self, dtype: str):
+        if np.dtype(dtype).name not in self.dtypes:
+            raise ValueError(f'The data type should be one of {self.dtypes}, not {dtype}')
+        self._dtype = np.dtype(dtype)
+
+    @property
+    def adc_gain(self) -> float:
+        """Get/Set the number of ADC counts per unit of intensity, applied when the data type is an integer one
+
+        Replayed frames are taken as already digitized and are not scaled.
+        """
+        return self._adc_gain
+
+    @adc_gain.setter
+    def adc_gain(self, gain: float):
+        if gain <= 0:
+            raise ValueError(f'An ADC gain of {gain} is not possible. It should be strictly positive')
+        self._adc_gain = float(gain)
+
+    @property
+    def spectrum_shape(self) -> Tuple[int]:
+        """Get the shape of the grabbed spectra"""
+        if self.replaying:
+            return self._replay.shape[-1],
+        x_start, x_stop, _, _ = self.roi
+        return x_stop - x_start,
+
+    @property
+    def image_shape(self) -> Tuple[int, int]:
+        """Get the shape of the grabbed images (ROI and binning applied)"""
+        if self.replaying and self._replay.ndim == 3:
+            return self._replay.shape[1:]
+        x_start, x_stop, y_start, y_stop = self.roi
+        return (y_stop - y_start) // self._binning, self.spectrum_shape[0]
 
     def find_reference(self):
         """Simulate the moving of the grating into a known "limit" for absolute positioning"""
         self.set_wavelength(600, 'abs')
 
+    @instrumented
     def set_wavelength(self, value, set_type='abs'):
         """Move the grating to set the central wavelength out of the spectrometer"""
         if set_type == 'abs' and value < 0:
@@ -132,6 +298,9 @@ class Spectrometer:
             self._alpha = math.fabs(math.log(self._espilon / 10))
         self._start_time = perf_counter()
         self._moving = True
+        self._invalidate_cache()
+        with self._motion_changed:
+            self._motion_changed.notify_all()
 
     def get_wavelength(self):
         """Get the current central wavelength in the spectrometer"""
@@ -142,14 +311,130 @@ class Spectrometer:
                 (self._init_value - self._target_lambda) + self._target_lambda
         return self._lambda
 
+    def wavelength_at(self, times: Union[float, np.ndarray]) -> np.ndarray:
+        """Compute the central wavelength of the current grating motion at given times
+
+        Parameters
+        ----------
+        times: float or ndarray
+            timestamps on the perf_counter clock, times before the start of the motion are taken as its start
+
+        Returns
+        -------
+        ndarray: the central wavelengths with the same shape as times
+        """
+        times = np.asarray(times, dtype=float)
+        if not self._moving:
+            return np.full(times.shape, float(self._lambda))
+        elapsed = np.clip(times - self._start_time, 0., None)
+        return np.exp(- self._alpha * elapsed / self._tau) * (self._init_value - self._target_lambda) + \
+            self._target_lambda
+
+    def time_to_settle(self, epsilon: float = None) -> float:
+        """Get the time left before the central wavelength is within epsilon of its target
+
+        Parameters
+        ----------
+        epsilon: float
+            the wavelength tolerance, defaults to the precision of the grating motion
+
+        Returns
+        -------
+        float: the remaining time in seconds, 0 if settled or not moving
+        """
+        if epsilon is None:
+            epsilon = self._espilon
+        if epsilon <= 0:
+            raise ValueError(f'A tolerance of {epsilon} is not possible. It should be strictly positive')
+        if not self._moving:
+            return 0.
+        distance = math.fabs(self._init_value - self._target_lambda)
+        if distance <= epsilon:
+            return 0.
+        settle_time = self._tau / self._alpha * math.log(distance / epsilon)
+        return max(0., self._start_time + settle_time - perf_counter())
+
+    def wait_move_done(self, timeout: float = None, epsilon: float = None) -> bool:
+        """Block until the current grating motion is settled within epsilon, or stopped
+
+        The waiting thread sleeps for the analytical settle time and is woken up if the motion is stopped or its
+        target changed meanwhile
+
+        Parameters
+        ----------
+        timeout: float, optional
+            the maximum time to wait in seconds, wait until settled if None
+        epsilon: float, optional
+            the wavelength tolerance, defaults to the precision of the grating motion
+
+        Returns
+        -------
+        bool: True if the motion is done, False if the timeout expired before
+        """
+        deadline = None if timeout is None else perf_counter() + timeout
+        with self._motion_changed:
+            while True:
+                remaining = self.time_to_settle(epsilon)
+                if remaining <= 0.:
+                    return True
+                if deadline is not None:
+                    time_left = deadline - perf_counter()
+                    if time_left <= 0.:
+                        return False
+                    remaining = min(remaining, time_left)
+                self._motion_changed.wait(remaining)
+
+    def _invalidate_cache(self):
+        """Drop the memoized wavelength axis and line shape, to be called whenever one of their parameters changes"""
+        self._cache.clear()
+
     def get_wavelength_axis(self):
         """Get the wavelength axis out of the spectrometer (dependent of the central wavelength (grating position))
-        and dispersion of the selected grating"""
+        and dispersion of the selected grating
+
+        The axis is memoized as long as the grating and the central wavelength don't change, it is therefore
+        returned as a read-only array
+        """
+        cached = self._cache.get('axis')
+        if cached is not None and cached[0] == self._lambda:
+            return cached[1]
         if self._grating == 'G300':
             coeff = 0.7
         elif self._grating == 'G1200':
             coeff = 0.25
-        return (np.linspace(0, self.Nx, self.Nx, endpoint=False) - self.Nx / 2) * coeff + self._lambda
+        x_start, x_stop, _, _ = self.roi
+        axis = (np.arange(x_start, x_stop, dtype=float) - self._Nx / 2) * coeff + self._lambda
+        axis.flags.writeable = False
+        self._cache['axis'] = (self._lambda, axis)
+        return axis
+
+    def _get_line_shape(self) -> np.ndarray:
+        """Get the noiseless spectrum over the current wavelength axis
+
+        Memoized as the wavelength axis, the cache being invalidated when the grating, the central wavelength,
+        the width, the amplitude, the data wavelength, the peaks or the background are changed
+        """
+        cached = self._cache.get('line_shape')
+        if cached is not None and cached[0] == self._lambda:
+            return cached[1]
+        line_shape = self._get_response(self.get_wavelength_axis())
+        line_shape.flags.writeable = False
+        self._cache['line_shape'] = (self._lambda, line_shape)
+        return line_shape
+
+    def _get_y_profile(self) -> np.ndarray:
+        """Get the (memoized) vertical profile of the image over the ROI rows, binning applied"""
+        y_profile = self._cache.get('y_profile')
+        if y_profile is None:
+            _, _, y_start, y_stop = self.roi
+            n_rows = (y_stop - y_start) // self._binning
+            y_axis_array = np.arange(y_start, y_start + n_rows * self._binning, dtype=float)
+            y_profile = gauss1D(y_axis_array, (self._Ny - 1) / 2, 50 * self._Ny / 128)
+            if self._binning > 1:
+                y_profile = y_profile.reshape((n_rows, self._binning)).sum(axis=1)
+            y_profile.flags.writeable = False
+            self._cache['y_profile'] = y_profile
+        return y_profile
 
     @property
     def data_wavelength(self,):
@@ -162,6 +447,48 @@ class Spectrometer:
         if lambda0 < 0:
             raise ValueError('Wavelength cannot be negative')
         self._lambda0 = lambda0
+        self._invalidate_cache()
+
+    @property
+    def peaks(self) -> List[Peak]:
+        """Get/Set the spectral lines measured by the spectrometer
+
+        Set it to a list of Peak (or of tuples with the Peak fields) to replace the single gaussian line defined by
+        data_wavelength, width and amplitude, or to None to go back to it
+        """
+        if self._peaks is None:
+            return [Peak(self._lambda0, self._wh, self._amp)]
+        return self._peaks.peaks
+
+    @peaks.setter
+    def peaks(self, peaks: List[Union[Peak, tuple]]):
+        if peaks is None:
+            self._peaks = None
+        else:
+            self._peaks = PeakSet(peaks, self._background)
+        self._invalidate_cache()
+
+    @property
+    def background(self) -> np.ndarray:
+        """Get/Set the background added to the spectral lines, as the coefficients of a polynomial in wavelength
+        (highest degree first)"""
+        return self._background
+
+    @background.setter
+    def background(self, background: Union[float, List[float]]):
+        self._background = np.atleast_1d(np.asarray(background, dtype=float))
+        if self._peaks is not None:
+            self._peaks = PeakSet(self._peaks.peaks, self._background)
+        self._invalidate_cache()
+
+    def _get_response(self, lambda_axis: np.ndarray) -> np.ndarray:
+        """Get the noiseless response of the physical process over the wavelength axis"""
+        if self._peaks is not None:
+            return self._peaks(lambda_axis)
+        response = self._amp * gauss1D(lambda_axis, self._lambda0, self._wh)
+        if np.any(self._background != 0.):
+            response += np.polyval(self._background, lambda_axis)
+        return response
 
     def _set_data_response(self, lambda_axis: Union[float, Iterable] = 515) -> np.ndarray:
         """Defines the wavelength response of the physical process measured by our spectrometer
@@ -183,31 +510,499 @@ class Spectrometer:
                 if not isinstance(lambda_axis[0], Number):
                     raise TypeError('lambda_axis should be an iterable of float')
 
-        return self._amp * gauss1D(lambda_axis, self._lambda0, self._wh) + self._noise * np.random.rand(len(lambda_axis))
-
-    def _get_data_0D(self, data=None):
+        return self._get_response(lambda_axis) + \
+            self._noise * self._noise_generator.draw(len(lambda_axis))
+
+    def _add_noise(self, line_shape: np.ndarray, shape: tuple, out: np.ndarray = None) -> np.ndarray:
+        """Add the noise to the line shape broadcasted to shape, drawing the noise directly into out if possible"""
+        if out is None or out.shape != shape or out.dtype != np.float64 or not out.flags.c_contiguous:
+            noise = self._noise_generator.draw(shape)
+            noise *= self._noise
+            return np.add(line_shape, noise, out=out)
+        self._noise_generator.draw(shape, out=out)
+        out *= self._noise
+        out += line_shape
+        return out
+
+    def _work_buffer(self, shape: tuple, out: np.ndarray = None) -> np.ndarray:
+        """Get the float array into which a frame is computed: out itself if it is a float array"""
+        if out is not None:
+            if out.shape != shape:
+                raise ValueError(f'The output array should be of shape {shape}, not {out.shape}')
+            if np.issubdtype(out.dtype, np.floating):
+                return out
+        elif np.issubdtype(self._dtype, np.floating):
+            return np.empty(shape, self._dtype)
+        return np.empty(shape)
+
+    def _finalize(self, data: np.ndarray, out: np.ndarray = None, counts: bool = False) -> np.ndarray:
+        """Convert a computed frame to the output data type (the one of out if given), integers being scaled by the
+        ADC gain, unless the data are already counts (replayed frames), rounded and clipped as done by an ADC"""
+        dtype = self._dtype if out is None else out.dtype
+        if data.dtype == dtype:
+            return data
+        if np.issubdtype(dtype, np.integer):
+            info = np.iinfo(dtype)
+            if not counts:
+                data *= self._adc_gain
+            np.rint(data, out=data)
+            np.clip(data, info.min, info.max, out=data)
+        if out is None:
+            return data.astype(dtype)
+        out[...] = data
+        return out
+
+    def _get_data_0D(self, data=None, out: np.ndarray = None):
         """Get the data at the central wavelength of the spectrometer"""
         if data is None:
             data = self._set_data_response(self.get_wavelength())
+        if out is not None:
+            out[...] = data
+            data = out
         return data
 
-    def _get_data_1D(self, data=None):
+    def _get_data_1D(self, data=None, out: np.ndarray = None):
         """Get the data as a function of the wavelength axis of the spectrometer
+
+        If out is given, the data is written into it and no new array is allocated for the result
         """
         if data is None:
-            data = self._set_data_response(self.get_wavelength_axis())
+            line_shape = self._get_line_shape()
+            data = self._add_noise(line_shape, line_shape.shape, out)
+        elif out is not None:
+            out[...] = data
+            data = out
         return data
 
-    def grab_spectrum(self):
-        """get the intensity spectrum out of the spectrometer"""
-        return self._get_data_1D()
+    @property
+    def timing(self) -> FrameClock:
+        """Get the frame schedule of the sensor, None if the frames are available instantly"""
+        return self._clock
+
+    @property
+    def missed_frames(self) -> int:
+        """Get the number of frames (or triggers) lost because no grab was waiting for them"""
+        return 0 if self._clock is None else self._clock.missed
+
+    def set_timing(self, exposure: float = 0., readout: float = 0., max_fps: float = 0., trigger: str = 'internal'):
+        """Make the grabs wait for the frames to be available on a realistic schedule, see FrameClock
 
-    def grab_image(self):
-        y_axis_array = np.linspace(0, 127, 128)
+        Parameters
+        ----------
+        exposure: float
+            the exposure time in s
+        readout: float
+            the readout time in s
+        max_fps: float
+            the maximum frame rate in Hz, 0 for no limit other than the exposure and readout times
+        trigger: str
+            'internal' for a free running sensor or 'external' for exposures started by `trigger`
+        """
+        self._clock = FrameClock(exposure, readout, max_fps, trigger)
+
+    def disable_timing(self):
+        """Go back to frames available instantly"""
+        self._clock = None
+
+    def trigger(self):
+        """Send a hardware trigger starting an exposure (external trigger mode)"""
+        if self._clock is None:
+            raise RuntimeError('The timing model is disabled, see set_timing')
+        self._clock.trigger()
+
+    def _wait_frames(self, n: int):
+        """Wait until n frames are available, if the timing model is enabled"""
+        if self._clock is not None:
+            self._clock.wait_frames(n)
+
+    @property
+    def replaying(self) -> bool:
+        """Check if the grabbed data are served from recorded frames"""
+        return self._replay is not None
+
+    def load_replay(self, path: Union[str, Path], rate: float = None, loop: bool = True, dataset: str = None,
+                    dtype: str = None, frame_shape: Tuple[int, ...] = None):
+        """Serve recorded frames instead of synthesizing them
+
+        The recorded frames are memory-mapped (or read on demand from the HDF5 file), so the dataset is never copied
+        in memory. They are served as recorded, the ROI being ignored along the wavelength axis: recorded images of
+        shape (n, Ny, Nx) are served whole (ROI and binning ignored) and vertically summed to get spectra, while
+        recorded spectra of shape (n, Nx) are turned into images using the vertical profile of the sensor, so over
+        the ROI rows and with the binning applied.
+
+        Parameters
+        ----------
+        path: str or Path
+            a .npy file, a .h5/.hdf5 file or a raw binary file holding the frames along its first axis
+        rate: float, optional
+            the playback rate in Hz: the frame served is the one recorded at the time elapsed since the loading. If
+            None, each grab serves the next frame
+        loop: bool
+            if True restart from the first frame once the last one has been served, else keep serving the last one
+        dataset: str
+            the path of the dataset within a HDF5 file, optional if the file holds a single dataset
+        dtype: str
+            the data type of a raw file
+        frame_shape: tuple of int
+            the shape of a frame of a raw file
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError(f'A playback rate of {rate} is not possible. It should be strictly positive')
+        self.stop_replay()
+        path = Path(path)
+        if path.suffix.lower() == '.npy':
+            frames = np.load(path, mmap_mode='r')
+        elif path.suffix.lower() in ('.h5', '.hdf5'):
+            import h5py
+            self._replay_file = h5py.File(path, 'r')
+            if dataset is None:
+                datasets = [name for name, node in self._replay_file.items() if isinstance(node, h5py.Dataset)]
+                if len(datasets) != 1:
+                    self.stop_replay()
+                    raise ValueError(f'The dataset to replay should be specified among {datasets}')
+                dataset = datasets[0]
+            frames = self._replay_file[dataset]
+        else:
+            if dtype is None or frame_shape is None:
+                raise ValueError('The data type and the frame shape of a raw file should be specified')
+            frames = np.memmap(path, dtype=dtype, mode='r')
+            frames = frames.reshape((-1,) + tuple(frame_shape))
+        if frames.ndim not in (2, 3) or len(frames) == 0:
+            self.stop_replay()
+            raise ValueError(f'Recorded frames should be a non empty stack of spectra or images, not of shape '
+                             f'{frames.shape}')
+        self._replay = frames
+        self._replay_rate = rate
+        self._replay_loop = loop
+        self._replay_index = 0
+        self._replay_start = perf_counter()
+        self._invalidate_cache()
+
+    def stop_replay(self):
+        """Go back to synthesized frames"""
+        self._replay = None
+        if self._replay_file is not None:
+            self._replay_file.close()
+            self._replay_file = None
+        self._invalidate_cache()
+
+    def _next_replay_frame(self) -> np.ndarray:
+        """Get the recorded frame to be served now, as a float array"""
+        if self._replay_rate is None:
+            index = self._replay_index
+            self._replay_index += 1
+        else:
+            index = int((perf_counter() - self._replay_start) * self._replay_rate)
+        if self._replay_loop:
+            index %= len(self._replay)
+        else:
+            index = min(index, len(self._replay) - 1)
+        return np.asarray(self._replay[index], dtype=float)
+
+    def _replay_spectrum(self) -> np.ndarray:
+        frame = self._next_replay_frame()
+        return frame if frame.ndim == 1 else frame.sum(axis=0)
+
+    def _replay_image(self) -> np.ndarray:
+        frame = self._next_replay_frame()
+        return frame if frame.ndim == 2 else np.outer(self._get_y_profile(), frame)
+
+    @instrumented
+    def grab_spectrum(self, out: np.ndarray = None):
+        """get the intensity spectrum out of the spectrometer
+
+        Parameters
+        ----------
+        out: ndarray, optional
+            a preallocated array of shape spectrum_shape into which the spectrum is written (and converted to its
+            dtype)
+        """
+        work = self._work_buffer(self.spectrum_shape, out)
+        self._wait_frames(1)
+        if self.replaying:
+            work[...] = self._replay_spectrum()
+            return self._finalize(work, out, counts=True)
+        return self._finalize(self._get_data_1D(out=work), out)
+
+    @instrumented
+    def grab_image(self, out: np.ndarray = None, lazy: bool = False):
+        """get the image out of the spectrometer
+
+        Parameters
+        ----------
+        out: ndarray, optional
+            a preallocated array of shape image_shape into which the image is written (and converted to its dtype)
+        lazy: bool
+            if True, return the image as a SeparableImage (the image being the outer product of the vertical profile
+            and of the spectrum) only materialized when converted into an array
+        """
+        if lazy and not (self.replaying and self._replay.ndim == 3):
+            if out is not None:
+                raise ValueError('A lazy image cannot be written into an output array')
+            self._wait_frames(1)
+            if self.replaying:
+                data1D = self._replay_spectrum()
+            else:
+                data1D = self._get_data_1D()
+                if np.issubdtype(self._dtype, np.integer):
+                    data1D *= self._adc_gain
+            return SeparableImage(self._get_y_profile(), data1D, self._dtype)
+        work = self._work_buffer(self.image_shape, out)
+        self._wait_frames(1)
+        if self.replaying:
+            work[...] = self._replay_image()
+            return self._finalize(work, out, counts=True)
         data1D = self._get_data_1D()
-        data2D = np.outer(gauss1D(y_axis_array, np.mean(y_axis_array), 50), data1D)
-        return data2D
+        data2D = np.outer(self._get_y_profile(), data1D, out=work)
+        return self._finalize(data2D, out)
+
+    @instrumented
+    def grab_monochromator(self, out: np.ndarray = None):
+        """get the intensity at the central wavelength
+
+        Parameters
+        ----------
+        out: ndarray, optional
+            a preallocated array of shape (1,) into which the intensity is written (and converted to its dtype)
+        """
+        work = self._work_buffer((1,), out)
+        self._wait_frames(1)
+        if self.replaying:
+            spectrum = self._replay_spectrum()
+            work[0] = spectrum[len(spectrum) // 2]
+            return self._finalize(work, out, counts=True)
+        return self._finalize(self._get_data_0D(out=work), out)
+
+    @instrumented
+    def sweep(self, start: float, stop: float, step: float, dwell: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Simulate in one call a monochromator step scan: move the grating step by step, waiting dwell seconds at
+        each step before reading the intensity
+
+        The grating motion model accounts for the incomplete settling during each dwell: each move starts from the
+        position actually reached at the previous step. The grating is left moving towards the last position as if
+        the scan had really been done.
+
+        The intensities always come from the synthesized spectrum model: the sweep neither reads the replayed
+        recording (see load_replay) nor waits on the frame clock (see set_timing). The only timing it simulates is
+        the dwell of the grating motion.
+
+        Parameters
+        ----------
+        start: float
+            the first central wavelength of the scan
+        stop: float
+            the last central wavelength of the scan, not reached if not an integer number of steps from start (up
+            to the float rounding of the step)
+        step: float
+            the absolute wavelength step
+        dwell: float
+            the time in seconds between the start of each move and the reading
 
-    def grab_monochromator(self):
-        """get the intensity at the central wavelength"""
-        return self._get_data_0D()
+        Returns
+        -------
+        wavelengths: ndarray
+            the central wavelengths actually reached at each reading
+        intensities: ndarray
+            the intensities read at each step, converted to dtype
+        """
+        if step <= 0:
+            raise ValueError(f'A step of {step} is not possible. It should be strictly positive')
+        if dwell < 0:
+            raise ValueError(f'A dwell time of {dwell}s is not possible. It should be positive')
+        if start < 0 or stop < 0:
+            raise ValueError('Wavelength cannot be negative')
+        # the tolerance keeps the last step when float rounding makes the ratio fall just short of an integer
+        npts = int(math.floor(abs(stop - start) / step + 1e-9)) + 1
+        targets = np.linspace(start, start + math.copysign((npts - 1) * step, stop - start), npts)
+
+        # the settling depends on the distance to travel, so each step depends on the previous one
+        wavelengths = np.empty((npts,))
+        position = self.get_wavelength()
+        for ind, target in enumerate(targets):
+            init_value = position
+            distance = init_value - target
+            alpha = math.fabs(math.log(self._espilon / (math.fabs(distance) if distance != 0 else 10)))
+            position = target + distance * math.exp(- alpha * dwell / self._tau)
+            wavelengths[ind] = position
+
+        intensities = self._get_response(wavelengths)
+        intensities += self._noise * self._noise_generator.draw(npts)
+
+        self._init_value = init_value
+        self._target_lambda = targets[-1]
+        self._alpha = alpha
+        self._start_time = perf_counter() - dwell
+        self._lambda = position
+        self._moving = True
+        self._invalidate_cache()
+        with self._motion_changed:
+            self._motion_changed.notify_all()
+        return wavelengths, self._finalize(intensities)
+
+    @instrumented
+    def grab_spectra(self, n: int = 1, out: np.ndarray = None) -> np.ndarray:
+        """get n intensity spectra out of the spectrometer in one call
+
+        The spectrum line shape is shared by the whole batch and the noise of all frames is drawn at once.
+
+        Parameters
+        ----------
+        n: int
+            the number of spectra to acquire
+        out: ndarray, optional
+            a preallocated array of shape (n,) + spectrum_shape into which the spectra are written
+
+        Returns
+        -------
+        ndarray: array of shape (n,) + spectrum_shape
+        """
+        if n < 1:
+            raise ValueError(f'The number of frames should be strictly positive, not {n}')
+        work = self._work_buffer((n,) + self.spectrum_shape, out)
+        self._wait_frames(n)
+        if self.replaying:
+            for ind in range(n):
+                work[ind] = self._replay_spectrum()
+            return self._finalize(work, out, counts=True)
+        return self._finalize(self._add_noise(self._get_line_shape(), work.shape, work), out)
+
+    @instrumented
+    def grab_images(self, n: int = 1, out: np.ndarray = None) -> np.ndarray:
+        """get n images out of the spectrometer in one call
+
+        Parameters
+        ----------
+        n: int
+            the number of images to acquire
+        out: ndarray, optional
+            a preallocated array of shape (n,) + image_shape into which the images are written
+
+        Returns
+        -------
+        ndarray: array of shape (n,) + image_shape
+        """
+        if n < 1:
+            raise ValueError(f'The number of frames should be strictly positive, not {n}')
+        work = self._work_buffer((n,) + self.image_shape, out)
+        self._wait_frames(n)
+        if self.replaying:
+            for ind in range(n):
+                work[ind] = self._replay_image()
+            return self._finalize(work, out, counts=True)
+        data1D = self._add_noise(self._get_line_shape(), (n,) + self.spectrum_shape)
+        data2D = np.multiply(self._get_y_profile()[np.newaxis, :, np.newaxis], data1D[:, np.newaxis, :], out=work)
+        return self._finalize(data2D, out)
+
+    @property
+    def streaming(self) -> bool:
+        """Check if the continuous acquisition mode is running"""
+        return self._stream_thread is not None and self._stream_thread.is_alive()
+
+    @property
+    def stream(self) -> FrameRing:
+        """Get the ring buffer filled by the continuous acquisition mode (None if never started)"""
+        return self._stream
+
+    def start_stream(self, rate: float = 10., depth: int = 16, dim: str = '1D', shared_name: str = None):
+        """Start the continuous acquisition mode
+
+        A background thread grabs frames at the given rate and pushes them, timestamped, into a bounded ring buffer
+        from which consumers pull them using `frames` or `latest`. If shared_name is given, the frames are also
+        written into a SharedFrameRing of that name to which consumers in other processes can attach
+
+        Parameters
+        ----------
+        rate: float
+            the frame rate in Hz
+        depth: int
+            the number of frames the ring buffer can hold before overwriting the oldest ones
+        dim: str
+            the kind of frames to produce: '0D' (monochromator), '1D' (spectrum) or '2D' (image)
+        shared_name: str, optional
+            the name of the shared memory block to publish the frames into, destroyed when the stream is stopped
+        """
+        grabbers = {'0D': self.grab_monochromator, '1D': self.grab_spectrum, '2D': self.grab_image}
+        if rate <= 0:
+            raise ValueError(f'A frame rate of {rate} is not possible. It should be strictly positive')
+        if dim not in grabbers:
+            raise ValueError(f'The frame dimensionality should be one of {list(grabbers.keys())}, not {dim}')
+        if self.streaming:
+            raise RuntimeError('The continuous acquisition mode is already running')
+        shapes = {'0D': (1,), '1D': self.spectrum_shape, '2D': self.image_shape}
+        self._stream = FrameRing(depth)
+        if shared_name is not None:
+            self._shared_stream = SharedFrameRing(shared_name, shapes[dim], self._dtype, depth, create=True)
+        self._stream_stop.clear()
+        self._stream_error = None
+        self._stream_thread = threading.Thread(target=self._produce_frames, args=(grabbers[dim], 1 / rate),
+                                               name='SpectrometerStream', daemon=True)
+        self._stream_thread.start()
+
+    def stop_stream(self):
+        """Stop the continuous acquisition mode, the frames already in the ring buffer remain available
+
+        A grab of the stream waiting for its frames (see set_timing) is aborted, as may be the grabs done meanwhile
+        from other threads.
+        """
+        if self._stream_thread is not None:
+            self._stream_stop.set()
+            clock = self._clock
+            if clock is not None:
+                clock.abort()
+            self._stream_thread.join()
+            if clock is not None:
+                clock.resume()
+            self._stream_thread = None
+            self._stream.close()
+        if self._shared_stream is not None:
+            self._shared_stream.close()
+            self._shared_stream = None
+
+    @property
+    def stream_error(self) -> Exception:
+        """Get the exception which stopped the continuous acquisition mode, None if it did not fail"""
+        return self._stream_error
+
+    def _produce_frames(self, grabber, period: float):
+        """Producer loop of the continuous acquisition mode, frames are triggered on absolute deadlines
+
+        If a grab fails, the stream is stopped and closed so that consumers are not left waiting, the exception
+        being logged and kept in stream_error. The shared ring, if any, is destroyed when the loop ends
+        """
+        try:
+            deadline = perf_counter()
+            while not self._stream_stop.is_set():
+                data = grabber()
+                timestamp = perf_counter()
+                self._stream.push(data, timestamp)
+                if self._shared_stream is not None:
+                    self._shared_stream.write(data, timestamp)
+                deadline += period
+                delay = deadline - perf_counter()
+                if delay > 0:
+                    if self._stream_stop.wait(delay):
+                        break
+                else:
+                    deadline = perf_counter()
+        except Exception as e:
+            # a grab aborted by stop_stream is the normal end of the stream
+            if not (isinstance(e, ClockAborted) and self._stream_stop.is_set()):
+                self._stream_error = e
+                logger.exception(f'The continuous acquisition mode stopped on an error: {e}')
+        finally:
+            if self._shared_stream is not None:
+                self._shared_stream.close()
+                self._shared_stream = None
+            self._stream.close()
+
+    def latest(self) -> Frame:
+        """Get the most recent streamed frame without waiting, None if no frame is available"""
+        if self._stream is None:
+            return None
+        return self._stream.latest()
+
+    def frames(self):
+        """Iterate over the streamed frames, blocking until each one is available, until the stream is stopped"""
+        if self._stream is None:
+            raise RuntimeError('The continuous acquisition mode has never been started')
+        return iter(self._stream)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import threading
+from time import perf_counter
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+class Frame(NamedTuple):
+    """A frame produced by a streaming instrument"""
+    index: int
+    timestamp: float
+    data: np.ndarray
+
+
+class FrameRing:
+    """Bounded ring buffer of timestamped frames with a single producer and a single consumer
+
+    The producer never waits for the consumer: it writes the frame into the next slot and increments the write
+    counter without any lock, then only briefly takes the condition lock to wake up the waiting consumers. When the
+    consumer doesn't keep pace, the oldest frames are overwritten and accounted for in the `dropped` counter, as done
+    by camera SDKs.
+
+    Parameters
+    ----------
+    depth: int
+        the number of frames the ring can hold
+    """
+
+    def __init__(self, depth: int = 16):
+        if depth < 1:
+            raise ValueError(f'The depth of the ring should be strictly positive, not {depth}')
+        self._depth = depth
+        self._slots: list = [None] * depth
+        self._written = 0
+        self._read = 0
+        self._dropped = 0
+        self._closed = False
+        self._new_frame = threading.Condition()
+
+    @property
+    def depth(self) -> int:
+        """Get the number of frames the ring can hold"""
+        return self._depth
+
+    @property
+    def produced(self) -> int:
+        """Get the total number of frames pushed into the ring"""
+        return self._written
+
+    @property
+    def dropped(self) -> int:
+        """Get the number of frames overwritten before being consumed"""
+        return self._dropped
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def push(self, data: np.ndarray, timestamp: float = None):
+        """Store a new frame, overwriting the oldest one if the ring is full (producer side)"""
+        if timestamp is None:
+            timestamp = perf_counter()
+        index = self._written
+        self._slots[index % self._depth] = Frame(index, timestamp, data)
+        self._written = index + 1
+        with self._new_frame:
+            self._new_frame.notify_all()
+
+    def close(self):
+        """Signal the end of the stream, waking up any waiting consumer"""
+        self._closed = True
+        with self._new_frame:
+            self._new_frame.notify_all()
+
+    def latest(self) -> Optional[Frame]:
+        """Get the most recent frame without waiting nor consuming it, None if no frame has been produced yet"""
+        written = self._written
+        if written == 0:
+            return None
+        return self._slots[(written - 1) % self._depth]
+
+    def get(self, timeout: float = None) -> Optional[Frame]:
+        """Get the oldest not yet consumed frame, waiting for it if necessary (consumer side)
+
+        Parameters
+        ----------
+        timeout: float, optional
+            maximum time to wait for a frame in seconds, wait forever if None
+
+        Returns
+        -------
+        Frame or None if the timeout expired or the ring has been closed and emptied
+        """
+        if self._read >= self._written:
+            with self._new_frame:
+                if not self._new_frame.wait_for(lambda: self._read < self._written or self._closed, timeout):
+                    return None
+        while self._read < self._written:
+            lag = self._written - self._read
+            if lag > self._depth:
+                self._dropped += lag - self._depth
+                self._read += lag - self._depth
+            frame = self._slots[self._read % self._depth]
+            if frame.index == self._read:
+                self._read += 1
+                return frame
+            # the slot has been overwritten by the producer while reading it, catch up
+        return None
+
+    def __iter__(self):
+        """Iterate over the frames as they are produced until the ring is closed and emptied"""
+        while True:
+            frame = self.get()
+            if frame is None:
+                if self._closed:
+                    return
+                continue
+            yield frame
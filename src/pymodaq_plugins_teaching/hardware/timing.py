@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import math
+import threading
+from collections import deque
+from time import perf_counter
+from typing import Deque
+
+from pymodaq_plugins_teaching import config as plugin_config
+from pymodaq_plugins_teaching.utils import Config
+
+
+TRIGGER_MODES = ['internal', 'external']
+
+
+class ClockAborted(RuntimeError):
+    """Raised by the waits of a FrameClock interrupted by `abort`"""
+
+
+class FrameClock:
+    """Frame schedule of a simulated sensor: exposure, readout, maximum frame rate and trigger
+
+    With the internal trigger, the sensor is free running from the start of the clock: the exposure of frame k starts
+    at t0 + k * period and the frame is available once read out, at t0 + k * period + exposure + readout. The
+    deadlines are absolute so no drift accumulates. Frames becoming available while no grab is waiting for them are
+    lost and counted as missed.
+
+    With the external trigger, an exposure starts at each call to `trigger`. Triggers arriving while the sensor is
+    still busy with the previous frame, less than a period after it, are ignored and counted as missed. The sensor
+    holds a single frame not waited for by any grab: triggers arriving while such a frame is pending are ignored
+    and counted as missed too, so the pending triggers never pile up.
+
+    Waits can be interrupted from another thread with `abort`, for instance to stop an acquisition loop waiting for
+    triggers which will never come.
+
+    Parameters
+    ----------
+    exposure: float
+        the exposure time in s
+    readout: float
+        the readout time in s
+    max_fps: float
+        the maximum frame rate in Hz, 0 for no limit other than the exposure and readout times
+    trigger: str
+        one of TRIGGER_MODES
+    """
+
+    def __init__(self, exposure: float = 0., readout: float = 0., max_fps: float = 0., trigger: str = 'internal'):
+        if exposure < 0 or readout < 0:
+            raise ValueError('The exposure and readout times should be positive')
+        if max_fps < 0:
+            raise ValueError(f'A maximum frame rate of {max_fps} is not possible. It should be positive')
+        if trigger not in TRIGGER_MODES:
+            raise ValueError(f'The trigger mode should be one of {TRIGGER_MODES}, not {trigger}')
+        self._exposure = exposure
+        self._readout = readout
+        self._max_fps = max_fps
+        self._trigger = trigger
+        self._triggers: Deque[float] = deque()
+        self._triggered = threading.Condition()
+        self._wanted = 0
+        self._aborted = False
+        self.start()
+
+    @classmethod
+    def from_config(cls, config: Config = None) -> 'FrameClock':
+        """Create a clock from the timing section of the plugin configuration"""
+        if config is None:
+            config = plugin_config
+        return cls(config('timing', 'exposure'), config('timing', 'readout'), config('timing', 'max_fps'),
+                   config('timing', 'trigger'))
+
+    @property
+    def exposure(self) -> float:
+        return self._exposure
+
+    @property
+    def readout(self) -> float:
+        return self._readout
+
+    @property
+    def max_fps(self) -> float:
+        return self._max_fps
+
+    @property
+    def trigger_mode(self) -> str:
+        return self._trigger
+
+    @property
+    def latency(self) -> float:
+        """Get the time from the start of an exposure to the availability of the frame"""
+        return self._exposure + self._readout
+
+    @property
+    def period(self) -> float:
+        """Get the minimum time between the starts of two exposures"""
+        return max(self.latency, 1 / self._max_fps if self._max_fps > 0 else 0.)
+
+    @property
+    def delivered(self) -> int:
+        """Get the number of frames delivered to grabs since the start of the clock"""
+        return self._delivered
+
+    @property
+    def missed(self) -> int:
+        """Get the number of frames (internal trigger) or triggers (external trigger) lost since the start"""
+        return self._missed
+
+    @property
+    def aborted(self) -> bool:
+        return self._aborted
+
+    def start(self):
+        """(Re)start the free running schedule from now, resetting the counters, the pending triggers and abort"""
+        with self._triggered:
+            self._aborted = False
+            self._t0 = perf_counter()
+            self._next = 0
+            self._last_exposure = -math.inf
+            self._delivered = 0
+            self._missed = 0
+            self._triggers.clear()
+
+    def abort(self):
+        """Interrupt the current and future waits, which raise ClockAborted until `resume` (or `start`) is called"""
+        with self._triggered:
+            self._aborted = True
+            self._triggered.notify_all()
+
+    def resume(self):
+        """Allow waiting for frames again after an `abort`, keeping the schedule and the counters"""
+        with self._triggered:
+            self._aborted = False
+
+    def trigger(self, timestamp: float = None):
+        """Start an exposure (external trigger), ignored if the sensor is busy or already holds an unread frame"""
+        if self._trigger != 'external':
+            raise RuntimeError('The sensor is not in external trigger mode')
+        if timestamp is None:
+            timestamp = perf_counter()
+        with self._triggered:
+            if (timestamp - self._last_exposure < self.period or
+                    len(self._triggers) >= max(1, self._wanted)):
+                self._missed += 1
+                return
+            self._last_exposure = timestamp
+            self._triggers.append(timestamp)
+            self._triggered.notify_all()
+
+    def wait_frames(self, n: int = 1, timeout: float = None) -> float:
+        """Wait until the next n frames are available
+
+        Parameters
+        ----------
+        n: int
+            the number of frames
+        timeout: float, optional
+            the maximum time in s to wait for the triggers (external trigger), None to wait forever
+
+        Returns
+        -------
+        float: the perf_counter time at which the last frame became available
+
+        Raises
+        ------
+        ClockAborted: if the wait is interrupted by `abort`
+        """
+        if self._trigger == 'internal':
+            with self._triggered:
+                self._check_aborted()
+                first = max(self._next, math.ceil((perf_counter() - self._t0 - self.latency) / self.period)
+                            if self.period > 0 else self._next)
+                self._missed += first - self._next
+                self._next = first + n
+                self._delivered += n
+            ready = self._t0 + (first + n - 1) * self.period + self.latency
+        else:
+            with self._triggered:
+                # the triggers waited for are kept, see trigger
+                self._wanted += n
+                try:
+                    received = self._triggered.wait_for(lambda: len(self._triggers) >= n or self._aborted, timeout)
+                finally:
+                    self._wanted -= n
+                self._check_aborted()
+                if not received:
+                    raise TimeoutError(f'{n} triggers were not received within {timeout}s')
+                for _ in range(n - 1):
+                    self._triggers.popleft()
+                ready = self._triggers.popleft() + self.latency
+                self._delivered += n
+        with self._triggered:
+            # an interruptible sleep until the frames are read out
+            self._triggered.wait_for(lambda: self._aborted, max(ready - perf_counter(), 0.))
+            self._check_aborted()
+        return ready
+
+    def _check_aborted(self):
+        if self._aborted:
+            raise ClockAborted('The wait for the frames has been aborted')
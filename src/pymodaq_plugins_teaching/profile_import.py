@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Import time and memory profiling of the plugin package modules
+
+Each module is imported in a fresh interpreter so that its full cost, dependencies included, is measured::
+
+    python -m pymodaq_plugins_teaching.profile_import
+    python -m pymodaq_plugins_teaching.profile_import pymodaq_plugins_teaching.hardware.keithley --repeat 5 --top 20
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import List, NamedTuple, Tuple
+
+
+MODULES = ['pymodaq_plugins_teaching',
+           'pymodaq_plugins_teaching.hardware.spectrometer',
+           'pymodaq_plugins_teaching.hardware.keithley',
+           'pymodaq_plugins_teaching.extensions.myextension']
+
+# tracemalloc slows imports down a lot, so time and memory are measured in distinct interpreters
+_TIME_PROFILER = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+print(json.dumps({'seconds': time.perf_counter() - start, 'modules': len(sys.modules)}))
+"""
+
+_MEMORY_PROFILER = """
+import importlib, json, sys, tracemalloc
+tracemalloc.start()
+importlib.import_module(sys.argv[1])
+current, peak = tracemalloc.get_traced_memory()
+print(json.dumps({'memory': current, 'peak_memory': peak}))
+"""
+
+
+class ImportProfile(NamedTuple):
+    """Cost of importing a module in a fresh interpreter"""
+    module: str
+    seconds: float  # wall time of the import
+    memory: int  # bytes allocated by the import and still in use afterwards
+    peak_memory: int  # peak of the bytes allocated during the import
+    modules: int  # number of modules loaded once the import is done
+    breakdown: List[Tuple[str, float]]  # (module, cumulative seconds) of the costliest imports, sorted
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, float]]:
+    """Get the cumulative import time of each module from the -X importtime report"""
+    breakdown = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        breakdown.append((name.strip(), int(cumulative) * 1e-6))
+    return sorted(breakdown, key=lambda item: item[1], reverse=True)
+
+
+def _run(script: str, module: str, python: str, *options: str) -> Tuple[dict, str]:
+    """Run a profiling script in a fresh interpreter, returning its json result and its stderr"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    process = subprocess.run([python, *options, '-c', script, module], capture_output=True, text=True, env=env)
+    if process.returncode != 0:
+        error = (process.stderr.strip().splitlines() or ['no error output'])[-1]
+        raise ImportError(f'{module} could not be imported:\n{error}')
+    return json.loads(process.stdout.strip().splitlines()[-1]), process.stderr
+
+
+def profile_module(module: str, python: str = sys.executable) -> ImportProfile:
+    """Import a module in fresh interpreters and measure its cost
+
+    Parameters
+    ----------
+    module: str
+        the full name of the module to import
+    python: str
+        the interpreter to use, by default the running one
+
+    Returns
+    -------
+    ImportProfile
+    """
+    timing, importtime = _run(_TIME_PROFILER, module, python, '-X', 'importtime')
+    memory, _ = _run(_MEMORY_PROFILER, module, python)
+    return ImportProfile(module, breakdown=_parse_importtime(importtime), **timing, **memory)
+
+
+def profile_modules(modules: List[str] = None, repeat: int = 1) -> List[ImportProfile]:
+    """Profile the import of each module, keeping the fastest of repeat runs to filter out the system jitter"""
+    if repeat < 1:
+        raise ValueError(f'At least one import should be profiled, not {repeat}')
+    if modules is None:
+        modules = MODULES
+    return [min((profile_module(module) for _ in range(repeat)), key=lambda profile: profile.seconds)
+            for module in modules]
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='Profile the import time and memory of the plugin modules')
+    parser.add_argument('modules', nargs='*', default=MODULES, help='full names of the modules to profile')
+    parser.add_argument('--repeat', type=int, default=3, help='number of imports per module, the fastest is kept')
+    parser.add_argument('--top', type=int, default=10, help='number of the costliest dependencies to report')
+    parser.add_argument('--json', action='store_true', help='print the profiles as json')
+    args = parser.parse_args(argv)
+
+    profiles = profile_modules(args.modules, args.repeat)
+    if args.json:
+        print(json.dumps([profile._asdict() for profile in profiles], indent=2))
+        return
+    for profile in profiles:
+        print(f'{profile.module}: {profile.seconds * 1000:.1f} ms, {profile.memory / 2 ** 20:.1f} MiB '
+              f'(peak {profile.peak_memory / 2 ** 20:.1f} MiB), {profile.modules} modules loaded')
+        for name, seconds in profile.breakdown[:args.top]:
+            print(f'    {seconds * 1000:10.1f} ms  {name}')
+
+
+if __name__ == '__main__':
+    main()
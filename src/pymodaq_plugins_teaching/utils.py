@@ -4,12 +4,109 @@ Created the 31/08/2023
 
 @author: Sebastien Weber
 """
+import importlib
+import pkgutil
+import sys
 from pathlib import Path
+from typing import Dict, List, TYPE_CHECKING
 
 from pymodaq.utils.config import BaseConfig, USER
 
+if TYPE_CHECKING:  # the package import should not pull Qt
+    from pymodaq.utils.parameter import Parameter
+    from pymodaq_plugins_teaching.hardware.spectrometer import Spectrometer
+
 
 class Config(BaseConfig):
     """Main class to deal with configuration values for this plugin"""
     config_template_path = Path(__file__).parent.joinpath('resources/config_template.toml')
     config_name = f"config_{__package__.split('pymodaq_plugins_')[1]}"
+
+
+class LazyPlugins:
+    """Lazy registry of the plugin modules of a plugin package
+
+    The plugin modules are listed from the package directory but only imported on first access, through the module
+    level ``__getattr__`` and ``__dir__`` of the package. Import failures are logged once and cached so that a plugin
+    missing some dependency is not imported again at each access.
+
+    Parameters
+    ----------
+    package: str
+        the name of the plugin package
+    path: Path
+        the path of the ``__init__.py`` file of the plugin package
+    logger: logging.Logger
+        the logger into which import failures are reported
+
+    Examples
+    --------
+    In the ``__init__.py`` of a plugin package:
+
+    >>> path = Path(__file__)
+    >>> plugins = LazyPlugins(__package__, path, logger)
+    >>> __getattr__, __dir__ = plugins.getattr, plugins.dir
+    """
+
+    def __init__(self, package: str, path: Path, logger):
+        self._package = package
+        self._path = Path(path)
+        self._logger = logger
+        self._names: List[str] = None
+        self.failures: Dict[str, Exception] = {}
+
+    @property
+    def names(self) -> List[str]:
+        """Get the (cached) names of the plugin modules of the package"""
+        if self._names is None:
+            self._names = [name for _, name, _ in pkgutil.iter_modules([str(self._path.parent)])]
+        return self._names
+
+    def getattr(self, name: str):
+        """Import the plugin module called name on first access"""
+        if name not in self.names:
+            raise AttributeError(f'module {self._package!r} has no attribute {name!r}')
+        if name in self.failures:
+            raise AttributeError(f"{name} plugin couldn't be loaded") from self.failures[name]
+        try:
+            return importlib.import_module('.' + name, self._package)
+        except Exception as e:
+            self.failures[name] = e
+            self._logger.warning("{:} plugin couldn't be loaded due to some missing packages or errors: {:}".format(
+                name, str(e)))
+            raise AttributeError(f"{name} plugin couldn't be loaded") from e
+
+    def dir(self) -> List[str]:
+        """List the attributes of the package together with its (possibly not imported) plugin modules"""
+        return sorted(set(sys.modules[self._package].__dict__) | set(self.names))
+
+
+# settings of the viewer plugins replaying recorded frames with a Spectrometer, see load_replay
+replay_params = [
+    {'title': 'Replay file:', 'name': 'replay_file', 'type': 'browsepath', 'value': '', 'filetype': True,
+     'tip': 'a .npy, .h5/.hdf5 or raw binary file holding the recorded frames along its first axis'},
+    {'title': 'Dataset:', 'name': 'dataset', 'type': 'str', 'value': '',
+     'tip': 'path of the dataset within a HDF5 file, may be empty if the file holds a single dataset'},
+    {'title': 'Rate (Hz):', 'name': 'rate', 'type': 'float', 'value': 0., 'min': 0.,
+     'tip': 'playback rate, if 0 each grab serves the next frame'},
+    {'title': 'Loop:', 'name': 'loop', 'type': 'bool', 'value': True},
+    {'title': 'Raw files:', 'name': 'raw', 'type': 'group', 'children': [
+        {'title': 'Data type:', 'name': 'dtype', 'type': 'list', 'value': 'uint16',
+         'limits': ['uint8', 'uint16', 'uint32', 'int16', 'int32', 'float32', 'float64']},
+        {'title': 'Frame shape:', 'name': 'frame_shape', 'type': 'str', 'value': '256',
+         'tip': 'comma separated shape of a frame, for instance 256 for spectra or 128, 256 for images'},
+    ]},
+]
+
+
+def load_replay(controller: 'Spectrometer', settings: 'Parameter'):
+    """Load into the controller the recorded frames described by the replay settings"""
+    if settings['replay_file'] == '':
+        controller.stop_replay()
+        return
+    controller.load_replay(settings['replay_file'],
+                           rate=settings['rate'] if settings['rate'] > 0 else None,
+                           loop=settings['loop'],
+                           dataset=settings['dataset'] if settings['dataset'] != '' else None,
+                           dtype=settings['raw', 'dtype'],
+                           frame_shape=tuple(int(size) for size in settings['raw', 'frame_shape'].split(',')))
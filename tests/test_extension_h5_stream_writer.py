@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import h5py
+import numpy as np
+import pytest
+
+from pymodaq_plugins_teaching.extensions.h5_stream_writer import H5StreamWriter, _ChannelBuffer
+
+
+def payload(ind: int) -> dict:
+    return {'spectro': {'data0D': {'CH0': {'data': np.array([ind])}},
+                        'data1D': {'CH0': {'data': np.full((10,), ind, dtype=np.float32)}},
+                        'data2D': {}}}
+
+
+@pytest.mark.parametrize('compression', ['none', 'gzip'])
+def test_write_frames(tmp_path, compression):
+    writer = H5StreamWriter(tmp_path.joinpath('data.h5'), compression=compression, chunk_frames=8, blocking=True)
+    writer.start()
+    for ind in range(50):
+        assert writer.submit(payload(ind), timestamp=float(ind))
+    writer.stop()
+    assert writer.written == 50
+    assert writer.error is None
+    with h5py.File(writer.path, 'r') as h5file:
+        dataset = h5file['spectro/data1D/CH0']
+        assert dataset.shape == (50, 10)
+        assert dataset.dtype == np.float32
+        assert dataset.chunks == (8, 10)
+        assert np.all(dataset[:, 0] == np.arange(50))
+        assert np.all(h5file['spectro/data1D/CH0_timestamps'][:] == np.arange(50))
+        assert h5file['spectro/data0D/CH0'].shape == (50, 1)
+
+
+def test_frames_are_copied(tmp_path):
+    writer = H5StreamWriter(tmp_path.joinpath('data.h5'), blocking=True)
+    writer.start()
+    data_all = payload(1)
+    writer.submit(data_all)
+    data_all['spectro']['data1D']['CH0']['data'][:] = 2
+    writer.stop()
+    with h5py.File(writer.path, 'r') as h5file:
+        assert np.all(h5file['spectro/data1D/CH0'][0] == 1)
+
+
+def test_not_running(tmp_path):
+    writer = H5StreamWriter(tmp_path.joinpath('data.h5'))
+    with pytest.raises(RuntimeError):
+        writer.submit(payload(0))
+    with pytest.raises(ValueError):
+        H5StreamWriter(tmp_path.joinpath('data.h5'), compression='zip')
+
+
+@pytest.mark.filterwarnings('error::pytest.PytestUnhandledThreadExceptionWarning')
+def test_failed_flush_closes_file(tmp_path, monkeypatch):
+    def failing_flush(buffer):
+        raise OSError('disk full')
+    monkeypatch.setattr(_ChannelBuffer, 'flush', failing_flush)
+    writer = H5StreamWriter(tmp_path.joinpath('data.h5'), chunk_frames=2, blocking=True)
+    writer.start()
+    for ind in range(3):
+        writer.submit(payload(ind))
+    writer.stop()
+    assert isinstance(writer.error, OSError)
+    with h5py.File(writer.path, 'r') as h5file:
+        assert h5file['spectro/data1D/CH0'].shape == (0, 10)
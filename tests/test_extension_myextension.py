@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+from types import SimpleNamespace
+from time import sleep
+
+import h5py
+import numpy as np
+import pytest
+from qtpy import QtWidgets
+
+from pymodaq.utils import gui_utils as gutils
+from pymodaq_plugins_teaching.extensions.myextension import MyExtension
+
+
+def payload(nx: int) -> dict:
+    return {'spectro': {'data0D': {}, 'data1D': {'CH0': {'data': np.zeros((nx,))}}, 'data2D': {}}}
+
+
+@pytest.fixture
+def extension(qtbot, tmp_path):
+    mainwindow = QtWidgets.QMainWindow()
+    dockarea = gutils.DockArea()
+    mainwindow.setCentralWidget(dockarea)
+    dashboard = SimpleNamespace(modules_manager=SimpleNamespace(settings_tree=QtWidgets.QWidget()))
+    extension = MyExtension(dockarea, dashboard)
+    extension.settings.child('main_settings', 'base_path').setValue(str(tmp_path))
+    extension.viewer1D = SimpleNamespace(show_data=lambda *args: None)  # only the saving is tested
+    yield extension
+    extension.stop_saving()
+
+
+def test_quit_closes_file(extension):
+    extension.settings.child('main_settings', 'save_data').setValue(True)
+    writer = extension.h5_writer
+    for _ in range(3):
+        extension.show_data(payload(10))
+    extension.get_action('quit').trigger()
+    assert extension.h5_writer is None
+    with h5py.File(writer.path, 'r') as h5file:
+        assert h5file['spectro/data1D/CH0'].shape == (3, 10)
+
+
+def test_saving_error_reported(extension):
+    extension.settings.child('main_settings', 'save_data').setValue(True)
+    writer = extension.h5_writer
+    extension.show_data(payload(10))
+    extension.show_data(payload(12))  # the channel shape changed, killing the writer
+    while writer.running:
+        sleep(0.01)
+    extension.show_data(payload(12))
+    assert extension.h5_writer is None
+    assert not extension.settings.child('main_settings', 'save_data').value()
+    assert 'stopped' in extension.settings.child('main_settings', 'info').value()
+
+
+def test_saving_start_error_reported(extension, tmp_path):
+    tmp_path.joinpath('file').touch()
+    extension.settings.child('main_settings', 'base_path').setValue(str(tmp_path.joinpath('file', 'data')))
+    extension.settings.child('main_settings', 'save_data').setValue(True)
+    assert extension.h5_writer is None
+    assert not extension.settings.child('main_settings', 'save_data').value()
+    assert 'stopped' in extension.settings.child('main_settings', 'info').value()
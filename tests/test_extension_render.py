@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq_plugins_teaching.extensions.render_scheduler import ChannelLayout, RenderScheduler
+
+
+def payload(n_channels=2, data1D=None):
+    data1D = np.zeros((10,)) if data1D is None else data1D
+    return {'det': {'data0D': {}, 'data1D': {f'CH{ind}': {'data': data1D} for ind in range(n_channels)},
+                    'data2D': {'CH0': {'data': np.zeros((3, 10))}}}}
+
+
+def test_layout_labels_cached():
+    layout = ChannelLayout()
+    assert layout.update(payload())
+    assert layout.labels == {'data1D': ['CH0', 'CH1'], 'data2D': ['CH0']}
+    assert not layout.update(payload())
+    assert layout.update(payload(3))
+    assert layout.labels['data1D'] == ['CH0', 'CH1', 'CH2']
+
+
+def test_layout_changes():
+    layout = ChannelLayout()
+    data_all = payload()
+    data, changed = layout.extract(data_all)
+    assert len(data['data1D']) == 2
+    assert changed == {'data1D': True, 'data2D': True}
+    data_all['det']['data1D']['CH1'] = {'data': np.ones((10,))}
+    data, changed = layout.extract(data_all)
+    assert changed == {'data1D': True, 'data2D': False}
+    assert np.all(data['data1D'][1] == 1)
+
+
+def test_scheduler_coalesces(qtbot):
+    rendered = []
+    scheduler = RenderScheduler(rendered.append, max_fps=10)
+    scheduler.submit(0)
+    qtbot.waitUntil(lambda: rendered == [0], timeout=1000)
+    for ind in range(1, 6):
+        scheduler.submit(ind)
+    assert rendered == [0]
+    qtbot.waitUntil(lambda: rendered == [0, 5], timeout=1000)
+    assert scheduler.skipped == 4
+    assert scheduler.rendered == 2
+
+
+def test_scheduler_invalid_rate(qtbot):
+    with pytest.raises(ValueError):
+        RenderScheduler(print, max_fps=0)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq_plugins_teaching.extensions.statistics import RunningStatistics, StatisticsStage
+
+
+@pytest.fixture
+def frames():
+    return np.random.default_rng(0).normal(3., 2., (200, 16))
+
+
+def test_running_statistics(frames):
+    statistics = RunningStatistics()
+    for frame in frames:
+        statistics.update(frame)
+    assert statistics.count == len(frames)
+    assert statistics.mean == pytest.approx(frames.mean(axis=0))
+    assert statistics.variance == pytest.approx(frames.var(axis=0, ddof=1))
+    assert statistics.min == pytest.approx(frames.min(axis=0))
+    assert statistics.max == pytest.approx(frames.max(axis=0))
+    assert statistics.ema == pytest.approx(frames.mean(axis=0))
+
+
+def test_no_allocation_per_frame(frames):
+    statistics = RunningStatistics(window=10)
+    statistics.update(frames[0])
+    buffers = [statistics.mean, statistics.variance, statistics.ema]
+    for frame in frames[1:]:
+        statistics.update(frame)
+    assert all(buffer is other for buffer, other in zip(buffers,
+                                                        [statistics.mean, statistics.variance, statistics.ema]))
+
+
+def test_window(frames):
+    statistics = RunningStatistics(window=50)
+    for frame in frames:
+        statistics.update(frame)
+    assert statistics.count == 50
+    assert statistics.mean == pytest.approx(frames[-50:].mean(axis=0))
+    alpha = 2 / 51
+    ema = frames[0].copy()
+    for frame in frames[1:]:
+        ema += alpha * (frame - ema)
+    assert statistics.ema == pytest.approx(ema)
+
+
+def test_stage(frames):
+    stage = StatisticsStage()
+    data_all = {'det': {'data0D': {}, 'data1D': {'CH0': {'data': frames[0]}}, 'data2D': {}}}
+    assert stage.process(data_all) is data_all
+    stage.mode = 'max'
+    for frame in frames:
+        data_all['det']['data1D']['CH0']['data'] = frame
+        processed = stage.process(data_all)
+    assert processed['det']['data1D']['CH0']['data'] == pytest.approx(frames.max(axis=0))
+    assert data_all['det']['data1D']['CH0']['data'] is frame
+    with pytest.raises(ValueError):
+        stage.mode = 'median'
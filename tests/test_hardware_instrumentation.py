@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import logging
+import time
+
+import numpy as np
+import pytest
+
+from pymodaq_plugins_teaching.hardware.instrumentation import LATENCY_EDGES, Telemetry, logger
+from pymodaq_plugins_teaching.hardware.keithley import Keithley2110
+from pymodaq_plugins_teaching.hardware.serial_addresses import SerialAddresses
+from pymodaq_plugins_teaching.hardware.spectrometer import Spectrometer
+
+
+def test_disabled_by_default():
+    spectro = Spectrometer()
+    spectro.grab_spectrum()
+    assert not spectro.instrumentation_enabled
+    assert spectro.stats() == {}
+
+
+def test_spectrometer_stats():
+    spectro = Spectrometer()
+    spectro.enable_instrumentation()
+    spectro.grab_spectrum()
+    spectro.grab_spectra(3)
+    spectro.grab_spectra(2)
+    spectro.grab_image(lazy=True)
+    stats = spectro.stats()
+    assert stats['grab_spectrum']['count'] == 1
+    assert stats['grab_spectrum']['bytes'] == spectro.Nx * 8
+    assert stats['grab_spectra']['count'] == 2
+    assert stats['grab_spectra']['bytes'] == 5 * spectro.Nx * 8
+    assert sum(stats['grab_spectra']['histogram']) == 2
+    assert stats['grab_image']['bytes'] == sum(spectro.image_shape) * 8
+    assert len(stats['grab_spectra']['histogram']) == len(LATENCY_EDGES) + 1
+    assert 0 < stats['grab_spectra']['min'] <= stats['grab_spectra']['mean'] <= stats['grab_spectra']['max']
+
+    with pytest.raises(ValueError):
+        spectro.grab_spectra(0)
+    assert spectro.stats()['grab_spectra']['errors'] == 1
+    spectro.reset_stats()
+    assert spectro.stats() == {}
+    spectro.disable_instrumentation()
+    assert spectro.stats() == {}
+
+
+def test_keithley_stats():
+    keithley = Keithley2110(SerialAddresses.names()[0])
+    keithley.enable_instrumentation()
+    keithley.set_function('curr_dc')
+    for _ in range(4):
+        keithley.get_reading()
+    stats = keithley.stats()
+    assert stats['set_function']['count'] == 1
+    assert stats['get_reading']['count'] == 4
+    assert stats['get_reading']['bytes'] == 4 * 8
+    assert stats['set_function']['bytes'] == 0
+
+
+def test_telemetry_bytes():
+    telemetry = Telemetry('test')
+    telemetry.record('array', 0., np.zeros(3, dtype=np.uint16))
+    telemetry.record('scalar', 0., 1.5)
+    telemetry.record('sequence', 0., (1., [np.zeros(2), 3]))
+    telemetry.record('none', 0.)
+    telemetry.record('string', 0., 'CURR:DC')
+    stats = telemetry.stats()
+    assert stats['array']['bytes'] == 6
+    assert stats['scalar']['bytes'] == 8
+    assert stats['sequence']['bytes'] == 8 + 16 + np.asarray(3).nbytes
+    assert stats['none']['bytes'] == 0
+    assert stats['string']['bytes'] == 0
+
+
+def test_periodic_log(caplog):
+    telemetry = Telemetry('Device')
+    telemetry.record('grab', 1e-3)
+    logger.propagate, propagate = True, logger.propagate
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        telemetry.start_logging(0.01)
+        time.sleep(0.1)
+        telemetry.stop_logging()
+    logger.propagate = propagate
+    assert 'Device.grab: 1 calls' in caplog.text
+    with pytest.raises(ValueError):
+        telemetry.start_logging(0)
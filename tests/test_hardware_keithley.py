@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import asyncio
+from time import perf_counter, sleep
+
+import numpy as np
+import pytest
+
+from pymodaq_plugins_teaching.hardware.keithley import Keithley2110, AsyncKeithley2110, ResourceManager
+from pymodaq_plugins_teaching.hardware.serial_addresses import SerialAddresses
+
+
+@pytest.fixture
+def meter():
+    meter = Keithley2110(SerialAddresses.names()[0])
+    yield meter
+    meter.close()
+
+
+def test_async_readings(meter):
+    async_meter = AsyncKeithley2110(meter)
+
+    async def read():
+        return await async_meter.get_reading(), await async_meter.get_readings(5)
+
+    reading, readings = asyncio.run(read())
+    assert 0 <= reading <= meter._range
+    assert len(readings) == 5
+
+
+def test_async_latency_overlaps():
+    latency = 0.05
+    meters = [AsyncKeithley2110(address=address, latency=latency) for address in SerialAddresses.names()]
+
+    async def read_all():
+        return await asyncio.gather(*[meter.get_reading() for meter in meters])
+
+    start = perf_counter()
+    readings = asyncio.run(read_all())
+    assert len(readings) == len(meters)
+    assert perf_counter() - start < len(meters) * latency
+    for meter in meters:
+        meter.meter.close()
+
+
+def test_async_stream(meter):
+    async_meter = AsyncKeithley2110(meter)
+
+    async def stream():
+        readings = []
+        async for reading in async_meter.stream_readings(0.001):
+            readings.append(reading)
+            if len(readings) == 3:
+                break
+        return readings
+
+    assert len(asyncio.run(stream())) == 3
+
+
+def test_async_invalid_latency(meter):
+    with pytest.raises(ValueError):
+        AsyncKeithley2110(meter, latency=-1)
+
+
+def test_fetch_buffer(meter):
+    assert meter.get_sample_count() == 1
+    meter.set_sample_count(1000)
+    meter.set_function_parameters('volt_dc', rng=10, resolution=0.5)
+    readings = meter.fetch_buffer()
+    assert readings.shape == (1000,)
+    assert np.all((readings >= 0) & (readings < 10))
+    assert np.allclose(readings / 0.5, np.round(readings / 0.5))
+
+
+def test_fetch_buffer_closed(meter):
+    with pytest.raises(ValueError):
+        meter.set_sample_count(0)
+    meter.close()
+    with pytest.raises(TimeoutError):
+        meter.fetch_buffer()
+
+
+@pytest.fixture
+def manager():
+    manager = ResourceManager()
+    yield manager
+    manager.close_all()
+
+
+def test_pool_shares_instrument(manager):
+    address = SerialAddresses.names()[0]
+    with manager.acquire(address) as session, manager.acquire(address) as other_session:
+        assert session.instrument is other_session.instrument
+        assert session.is_open
+        assert session.get_id() == other_session.get_id()
+        assert ResourceManager().list_opened_resources() == [address]
+    assert session.released
+    with pytest.raises(IOError):
+        session.get_reading()
+
+
+def test_pool_evicts_idle_instrument(manager, monkeypatch):
+    monkeypatch.setattr(ResourceManager, 'idle_timeout', 0.01)
+    session = manager.acquire(SerialAddresses.names()[0])
+    instrument = session.instrument
+    session.release()
+    session.release()
+    sleep(0.1)
+    assert manager.list_opened_resources() == []
+    assert not instrument.is_open
+
+
+def test_pool_reacquire_cancels_eviction(manager, monkeypatch):
+    monkeypatch.setattr(ResourceManager, 'idle_timeout', 0.05)
+    address = SerialAddresses.names()[0]
+    session = manager.acquire(address)
+    instrument = session.instrument
+    manager.release(session)
+    session = manager.acquire(address)
+    sleep(0.1)
+    assert session.instrument is instrument
+    assert instrument.is_open
+
+
+def test_configure_sends_only_diff():
+    meter = Keithley2110(SerialAddresses.names()[0])
+    with meter.configure() as cfg:
+        cfg.function = 'curr_dc'
+        cfg.rng = 1.
+        cfg.resolution = 1e-4
+    assert cfg.sent == dict(function='curr_dc', rng=1., resolution=1e-4)
+    assert meter.round_trips == 4  # first configuration: readback of the function and its parameters
+    assert meter.get_function_parameters('curr_dc') == (1., 1e-4, True)
+
+    round_trips = meter.round_trips
+    with meter.configure() as cfg:
+        cfg.function = 'curr_dc'
+        cfg.rng = 1.
+        cfg.autorng = False
+    assert cfg.sent == dict(autorng=False)
+    assert meter.round_trips == round_trips + 1
+
+    round_trips = meter.round_trips
+    with meter.configure() as cfg:
+        assert cfg.rng == 1.
+        cfg.rng = 1.
+    assert cfg.sent == {}
+    assert meter.round_trips == round_trips
+
+
+def test_configure_transactional():
+    meter = Keithley2110(SerialAddresses.names()[0])
+    with pytest.raises(ValueError):
+        with meter.configure() as cfg:
+            cfg.rng = 10.
+            cfg.function = 'not_a_function'
+    assert meter.get_function_parameters('volt_dc').rng == 0.1
+    with pytest.raises(AttributeError):
+        with meter.configure() as cfg:
+            cfg.not_a_parameter
+    meter.set_function_parameters('volt_dc', rng=10.)
+    with meter.configure() as cfg:
+        cfg.rng = 10.
+    assert cfg.sent == {}
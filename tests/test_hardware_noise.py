@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq_plugins_teaching.hardware.noise import NoiseGenerator, NOISE_MODELS
+
+
+@pytest.mark.parametrize('model', NOISE_MODELS)
+def test_seeded_generators_are_reproducible(model):
+    generator = NoiseGenerator(model, seed=12, block_size=7)
+    other_generator = NoiseGenerator(model, seed=12, block_size=100)
+    assert np.all(generator.draw((3, 10)) == other_generator.draw(30).reshape((3, 10)))
+    assert generator.draw_one() == other_generator.draw_one()
+
+
+def test_draw_into_buffer():
+    generator = NoiseGenerator(seed=0)
+    out = np.zeros((4, 5))
+    assert generator.draw(None, out=out) is out
+    assert np.all((out >= 0) & (out < 1))
+    with pytest.raises(ValueError):
+        generator.draw(None, out=out[:, ::2])
+
+
+def test_model_statistics():
+    generator = NoiseGenerator('gaussian', seed=0)
+    assert abs(np.mean(generator.draw(100000))) < 0.02
+    generator.model = 'poisson'
+    assert np.mean(generator.draw(100000)) == pytest.approx(1, abs=0.02)
+    with pytest.raises(ValueError):
+        generator.model = 'pink'
+
+
+def test_reseed():
+    generator = NoiseGenerator(seed=3)
+    data = generator.draw(10)
+    generator.seed(3)
+    assert np.all(generator.draw(10) == data)
+
+
+def test_config_generators_streams():
+    values = {('noise', 'seed'): 7, ('noise', 'model'): 'gaussian', ('noise', 'block_size'): 64,
+              ('noise', 'poisson_lambda'): 100.}
+
+    def config(*keys):
+        return values[keys]
+
+    generator = NoiseGenerator.from_config(config)
+    other_generator = NoiseGenerator.from_config(config)
+    assert not np.any(generator.draw(10) == other_generator.draw(10))
+    assert np.all(NoiseGenerator.from_config(config, stream=3).draw(10) ==
+                  NoiseGenerator.from_config(config, stream=3).draw(10))
+    values[('noise', 'seed')] = -1
+    assert not np.any(NoiseGenerator.from_config(config, stream=3).draw(10) ==
+                      NoiseGenerator.from_config(config, stream=3).draw(10))
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+from pymodaq.utils.math_utils import gauss1D
+
+from pymodaq_plugins_teaching.hardware.peaks import Peak, PeakSet, PEAK_SHAPES
+
+
+AXIS = np.linspace(400, 700, 1024)
+
+
+def test_gauss_matches_gauss1D():
+    peaks = PeakSet([Peak(500, 3, 2.), Peak(600, 10, 5.)])
+    assert peaks(AXIS) == pytest.approx(2 * gauss1D(AXIS, 500, 3) + 5 * gauss1D(AXIS, 600, 10))
+
+
+@pytest.mark.parametrize('shape', PEAK_SHAPES)
+def test_shapes_share_half_width(shape):
+    peak = PeakSet([Peak(550, 4, 1., shape)])
+    assert peak(np.array([550.]))[0] == pytest.approx(1)
+    assert peak(np.array([550 + 4 / np.sqrt(2)]))[0] == pytest.approx(0.5)
+
+
+def test_lorentz_has_wider_wings():
+    gauss, lorentz, voigt = [PeakSet([Peak(550, 4, 1., shape)])(np.array([570.]))[0] for shape in PEAK_SHAPES]
+    assert gauss < voigt < lorentz
+
+
+def test_background():
+    peaks = PeakSet([], background=[0.01, 2.])
+    assert peaks(AXIS) == pytest.approx(0.01 * AXIS + 2)
+
+
+def test_many_peaks():
+    centers = np.linspace(420, 680, 60)
+    peaks = PeakSet([(center, 1., 1.) for center in centers])
+    assert peaks(AXIS) == pytest.approx(np.sum([gauss1D(AXIS, center, 1.) for center in centers], axis=0))
+
+
+def test_invalid_peaks():
+    with pytest.raises(ValueError):
+        PeakSet([Peak(500, 0, 1.)])
+    with pytest.raises(ValueError):
+        PeakSet([Peak(500, 1, 1., 'square')])
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import time
+
+import numpy as np
+import pytest
+
+from pymodaq_plugins_teaching.hardware.keithley import Keithley2110
+from pymodaq_plugins_teaching.hardware.scheduler import ParallelScheduler
+from pymodaq_plugins_teaching.hardware.serial_addresses import SerialAddresses
+from pymodaq_plugins_teaching.hardware.spectrometer import Spectrometer
+
+
+def test_trigger_devices():
+    spectros = {f'spectro{ind}': Spectrometer() for ind in range(3)}
+    meter = Keithley2110(SerialAddresses.names()[0])
+    with ParallelScheduler(spectros) as scheduler:
+        scheduler.add('meter', meter)
+        assert scheduler.names == ['spectro0', 'spectro1', 'spectro2', 'meter']
+        result = scheduler.trigger()
+    assert result.index == 0
+    assert result.stack(list(spectros)).shape == (3, 256)
+    assert isinstance(result.data['meter'], float)
+    assert set(result.timestamps) == set(scheduler.names)
+    assert 0 <= result.start_skew <= result.duration
+    assert scheduler.skew_stats()['count'] == 1
+
+
+def test_trigger_is_parallel():
+    latency = 0.05
+    with ParallelScheduler({f'device{ind}': lambda: time.sleep(latency) for ind in range(8)}) as scheduler:
+        results = list(scheduler.triggers(3))
+    assert [result.index for result in results] == [0, 1, 2]
+    assert all(result.duration < 4 * latency for result in results)
+    assert scheduler.triggered == 3
+    assert scheduler.skew_stats()['max'] < latency
+    skews = np.array([result.skew for result in results])
+    stats = scheduler.skew_stats()
+    assert stats['mean'] == pytest.approx(skews.mean())
+    assert stats['std'] == pytest.approx(skews.std(), abs=1e-12)
+    assert stats['max'] == skews.max()
+
+
+def test_trigger_errors():
+    scheduler = ParallelScheduler()
+    with pytest.raises(ValueError):
+        scheduler.trigger()
+    with pytest.raises(TypeError):
+        scheduler.add('nothing', object())
+    scheduler.add('values', np.arange, 4)
+    scheduler.add('failing', lambda: 1 / 0)
+    with pytest.raises(KeyError):
+        scheduler.add('values', np.arange, 4)
+    with pytest.raises(ZeroDivisionError):
+        scheduler.trigger()
+    scheduler.remove('failing')
+    assert scheduler.trigger().data['values'] == pytest.approx(np.arange(4))
+    scheduler.close()
+
+
+def test_add_method_keyword():
+    spectro = Spectrometer()
+    with ParallelScheduler() as scheduler:
+        scheduler.add('image', spectro, method='grab_image')
+        scheduler.add('values', np.full, 3, fill_value=2.)
+        result = scheduler.trigger()
+    assert result.data['image'].ndim == 2
+    assert result.data['values'] == pytest.approx(np.full(3, 2.))
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq_plugins_teaching.hardware.separable import SeparableImage
+
+
+@pytest.fixture
+def images():
+    column = np.linspace(0, 1, 12)
+    row = np.linspace(1, 3, 20)
+    return SeparableImage(column, row), np.outer(column, row)
+
+
+def test_materialize(images):
+    lazy, dense = images
+    assert lazy.shape == dense.shape
+    assert np.asarray(lazy) == pytest.approx(dense)
+    assert np.asarray(lazy.T) == pytest.approx(dense.T)
+    assert lazy.nbytes == (12 + 20) * 8
+
+
+@pytest.mark.parametrize('item', [(slice(2, 8), slice(None, None, 3)), slice(1, 4), (3, slice(5, 9)),
+                                  (slice(None), -2), (4, 7)])
+def test_slicing(images, item):
+    lazy, dense = images
+    assert np.asarray(lazy[item]) == pytest.approx(dense[item])
+
+
+@pytest.mark.parametrize('axis', [None, 0, 1, -1])
+def test_sums(images, axis):
+    lazy, dense = images
+    assert lazy.sum(axis) == pytest.approx(dense.sum(axis))
+    assert lazy.mean(axis) == pytest.approx(dense.mean(axis))
+    assert lazy[2:5, 10:15].sum() == pytest.approx(dense[2:5, 10:15].sum())
+
+
+def test_integer_dtype():
+    lazy = SeparableImage(np.array([0.2, 300.]), np.array([1., 300.]), np.uint16)
+    assert np.asarray(lazy).dtype == np.uint16
+    assert np.asarray(lazy).tolist() == [[0, 60], [300, 65535]]
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import multiprocessing
+import uuid
+
+import numpy as np
+import pytest
+
+from pymodaq_plugins_teaching.hardware.shared_frames import SharedFrameRing
+from pymodaq_plugins_teaching.hardware.spectrometer import Spectrometer
+
+
+@pytest.fixture
+def name():
+    return f'test_frames_{uuid.uuid4().hex[:8]}'
+
+
+def test_write_and_read(name):
+    with SharedFrameRing(name, (4, 5), 'uint16', depth=3, create=True) as producer, \
+            SharedFrameRing(name) as consumer:
+        assert consumer.shape == (4, 5)
+        assert consumer.dtype == np.uint16
+        assert consumer.depth == 3
+        assert consumer.latest() is None
+        for ind in range(5):
+            producer.write(np.full((4, 5), ind), timestamp=float(ind))
+        frame = consumer.latest()
+        assert frame.index == 4
+        assert frame.timestamp == 4.
+        assert np.all(frame.data == 4)
+        assert consumer.read(2).index == 2
+        assert consumer.read(1) is None
+        assert consumer.read(5) is None
+
+
+def test_failed_write_leaves_slot_readable(name):
+    with SharedFrameRing(name, (4,), depth=2, create=True) as ring:
+        ring.write(np.ones((4,)))
+        with pytest.raises(ValueError):
+            ring.write(np.ones((5,)))
+        assert ring.produced == 1
+        assert ring.read(1) is None
+        assert ring.latest().index == 0
+        ring._headers['sequence'][0] += 1  # producer died while writing frame 0
+        with pytest.raises(TimeoutError):
+            ring.read(0, timeout=0.01)
+
+
+def test_latest_after_failed_write(name):
+    with SharedFrameRing(name, (4,), depth=1, create=True) as ring:
+        ring.write(np.ones((4,)))
+        with pytest.raises(ValueError):
+            ring.write(np.ones((5,)))
+        assert ring.latest() is None
+        ring.write(np.zeros((4,)))
+        assert ring.latest().index == 1
+
+
+def test_attach_to_unknown_block():
+    with pytest.raises(FileNotFoundError):
+        SharedFrameRing(f'unknown_{uuid.uuid4().hex[:8]}')
+
+
+def _consume(name, queue):
+    with SharedFrameRing(name) as consumer:
+        frame = consumer.latest()
+        queue.put((frame.index, float(frame.data.sum())))
+
+
+def test_other_process(name):
+    with SharedFrameRing(name, (8,), depth=2, create=True) as producer:
+        producer.write(np.ones((8,)))
+        queue = multiprocessing.get_context('spawn').Queue()
+        process = multiprocessing.get_context('spawn').Process(target=_consume, args=(name, queue))
+        process.start()
+        assert queue.get(timeout=30) == (0, 8.)
+        process.join()
+
+
+def test_spectrometer_shared_stream(name):
+    spectro = Spectrometer()
+    spectro.start_stream(rate=100, dim='2D', shared_name=name)
+    try:
+        with SharedFrameRing(name) as consumer:
+            assert consumer.shape == spectro.image_shape
+            while consumer.latest() is None:
+                pass
+            assert consumer.latest().data.shape == spectro.image_shape
+    finally:
+        spectro.stop_stream()
+
+
+def test_failed_spectrometer_shared_stream(name):
+    spectro = Spectrometer()
+
+    def failing_grab():
+        raise ValueError('broadcast error')
+    spectro.grab_image = failing_grab
+    spectro.start_stream(rate=100, dim='2D', shared_name=name)
+    assert list(spectro.frames()) == []
+    assert spectro._shared_stream is None
+    with pytest.raises(FileNotFoundError):
+        SharedFrameRing(name)
+    del spectro.grab_image
+    spectro.start_stream(rate=100, dim='1D')
+    try:
+        assert spectro._shared_stream is None
+        assert next(spectro.frames()).data.shape == spectro.spectrum_shape
+    finally:
+        spectro.stop_stream()
@@ -4,3 +4,309 @@ Created the 09/10/2022
 
 @author: Sebastien Weber
 """
+import numpy as np
+import pytest
+
+from pymodaq_plugins_teaching.hardware.spectrometer import Spectrometer
+
+
+@pytest.fixture
+def spectro():
+    return Spectrometer()
+
+
+def test_grab_spectra_shape(spectro):
+    data = spectro.grab_spectra(10)
+    assert data.shape == (10, spectro.Nx)
+    assert data.shape[1:] == spectro.grab_spectrum().shape
+
+
+def test_grab_spectra_frames_differ_only_by_noise(spectro):
+    data = spectro.grab_spectra(5)
+    assert np.all(np.ptp(data, axis=0) <= spectro.noise)
+
+
+def test_grab_spectra_invalid(spectro):
+    with pytest.raises(ValueError):
+        spectro.grab_spectra(0)
+
+
+def test_grab_images_shape(spectro):
+    data = spectro.grab_images(3)
+    assert data.shape == (3, spectro.Ny, spectro.Nx)
+    assert data.shape[1:] == spectro.grab_image().shape
+
+
+def test_wavelength_axis_cached(spectro):
+    axis = spectro.get_wavelength_axis()
+    assert spectro.get_wavelength_axis() is axis
+    assert not axis.flags.writeable
+
+
+@pytest.mark.parametrize('attribute, value', [('grating', 'G1200'), ('width', 5), ('amplitude', 20),
+                                              ('data_wavelength', 600)])
+def test_line_shape_invalidated(spectro, attribute, value):
+    line_shape = spectro._get_line_shape()
+    assert spectro._get_line_shape() is line_shape
+    setattr(spectro, attribute, value)
+    assert not np.allclose(spectro._get_line_shape(), line_shape)
+
+
+def test_wavelength_axis_follows_grating_motion(spectro):
+    spectro.tau = 0.01
+    axis = spectro.get_wavelength_axis().copy()
+    spectro.set_wavelength(10, 'rel')
+    while spectro.get_wavelength() < 541.99:
+        pass
+    wavelength = spectro.get_wavelength()
+    assert spectro.get_wavelength_axis() == pytest.approx(axis + wavelength - 532)
+
+
+@pytest.mark.parametrize('method, shape', [('grab_spectrum', 'spectrum_shape'),
+                                           ('grab_image', 'image_shape'),
+                                           ('grab_monochromator', None)])
+def test_grab_into_preallocated_buffer(spectro, method, shape):
+    out = np.zeros(getattr(spectro, shape) if shape is not None else (1,))
+    data = getattr(spectro, method)(out=out)
+    assert data is out
+    assert np.any(out != 0.)
+
+
+def test_grab_batch_into_preallocated_buffer(spectro):
+    out = np.zeros((4,) + spectro.image_shape)
+    assert spectro.grab_images(4, out=out) is out
+    out = np.zeros((4,) + spectro.spectrum_shape)
+    assert spectro.grab_spectra(4, out=out) is out
+
+
+def test_stream(spectro):
+    spectro.start_stream(rate=200, depth=4)
+    assert spectro.streaming
+    with pytest.raises(RuntimeError):
+        spectro.start_stream()
+    frames = []
+    for frame in spectro.frames():
+        frames.append(frame)
+        if len(frames) == 3:
+            break
+    spectro.stop_stream()
+    assert not spectro.streaming
+    assert frames[0].data.shape == spectro.spectrum_shape
+    assert [frame.timestamp for frame in frames] == sorted(frame.timestamp for frame in frames)
+    assert spectro.latest().index == spectro.stream.produced - 1
+
+
+def test_stream_error_closes_ring(spectro):
+    def failing_grab():
+        raise ValueError('broadcast error')
+    spectro.grab_spectrum = failing_grab
+    spectro.start_stream(rate=200)
+    assert list(spectro.frames()) == []
+    assert isinstance(spectro.stream_error, ValueError)
+    assert spectro.stream.closed
+    spectro.stop_stream()
+
+
+def test_wavelength_at(spectro):
+    spectro.tau = 0.1
+    assert spectro.wavelength_at(np.zeros((3,))) == pytest.approx(532)
+    spectro.set_wavelength(600)
+    start = spectro._start_time
+    wavelengths = spectro.wavelength_at(start + np.array([-1., 0., spectro.tau, 1000.]))
+    assert wavelengths[:2] == pytest.approx(532)
+    assert wavelengths[2] == pytest.approx(600, abs=spectro._espilon * 1.01)
+    assert wavelengths[3] == pytest.approx(600)
+
+
+def test_time_to_settle(spectro):
+    assert spectro.time_to_settle() == 0.
+    spectro.tau = 0.1
+    spectro.set_wavelength(600)
+    assert 0 < spectro.time_to_settle() <= spectro.tau
+    assert spectro.time_to_settle(1.) < spectro.time_to_settle(0.001)
+    with pytest.raises(ValueError):
+        spectro.time_to_settle(0)
+
+
+def test_wait_move_done(spectro):
+    spectro.tau = 0.05
+    spectro.set_wavelength(600)
+    assert not spectro.wait_move_done(timeout=0.)
+    assert spectro.wait_move_done(timeout=1.)
+    assert spectro.get_wavelength() == pytest.approx(600, abs=spectro._espilon)
+
+
+def test_seeded_spectrometers_are_reproducible():
+    spectros = [Spectrometer() for _ in range(2)]
+    for spectro in spectros:
+        spectro.noise_generator.seed(5)
+    assert np.all(spectros[0].grab_spectra(3) == spectros[1].grab_spectra(3))
+    assert np.all(spectros[0].grab_spectrum(out=np.empty(spectros[0].spectrum_shape)) == spectros[1].grab_spectrum())
+
+
+def test_default_geometry(spectro):
+    assert spectro.spectrum_shape == (spectro.Nx,)
+    assert spectro.image_shape == (spectro.Ny, spectro.Nx)
+    assert spectro.roi == (0, spectro.Nx, 0, spectro.Ny)
+
+
+def test_roi_and_binning(spectro):
+    spectro.Nx = 2048
+    spectro.Ny = 2048
+    full_axis = spectro.get_wavelength_axis()
+    image = spectro.grab_image()
+    spectro.roi = (100, 300, 1000, 1100)
+    spectro.binning = 4
+    assert spectro.image_shape == (25, 200)
+    assert spectro.get_wavelength_axis() == pytest.approx(full_axis[100:300])
+    binned_image = spectro.grab_image()
+    assert binned_image.shape == (25, 200)
+    expected = image[1000:1100, 100:300].reshape((25, 4, 200)).sum(axis=1)
+    assert binned_image == pytest.approx(expected, abs=4 * spectro.noise)
+    with pytest.raises(ValueError):
+        spectro.roi = (0, 3000, 0, 10)
+    with pytest.raises(ValueError):
+        spectro.binning = 101
+    spectro.roi = None
+    assert spectro.image_shape == (512, 2048)
+
+
+@pytest.mark.parametrize('dtype', Spectrometer.dtypes)
+def test_dtype(spectro, dtype):
+    spectro.dtype = dtype
+    assert spectro.grab_spectrum().dtype == dtype
+    assert spectro.grab_image().dtype == dtype
+    assert spectro.grab_images(2).dtype == dtype
+    assert spectro.grab_monochromator().dtype == dtype
+    out = np.empty(spectro.image_shape, dtype=dtype)
+    assert spectro.grab_image(out=out) is out
+    assert np.max(out) > 0.9 * spectro.amplitude * (spectro.adc_gain if dtype == 'uint16' else 1)
+
+
+def test_adc_gain(spectro):
+    spectro.noise_generator.seed(2)
+    spectrum = spectro.grab_spectrum()
+    spectro.dtype = 'uint16'
+    spectro.adc_gain = 1000
+    spectro.noise_generator.seed(2)
+    assert spectro.grab_spectrum() == pytest.approx(np.rint(1000 * spectrum), abs=1)
+    spectro.noise_generator.seed(2)
+    lazy_image = spectro.grab_image(lazy=True)
+    spectro.noise_generator.seed(2)
+    assert np.asarray(lazy_image) == pytest.approx(spectro.grab_image(), abs=1)
+    spectro.amplitude = 100
+    assert np.max(spectro.grab_spectrum()) == np.iinfo(np.uint16).max
+    with pytest.raises(ValueError):
+        spectro.adc_gain = 0
+
+
+def test_invalid_dtype(spectro):
+    with pytest.raises(ValueError):
+        spectro.dtype = 'int8'
+
+
+def test_lazy_image(spectro):
+    spectro.noise_generator.seed(1)
+    image = spectro.grab_image()
+    spectro.noise_generator.seed(1)
+    lazy_image = spectro.grab_image(lazy=True)
+    assert lazy_image.shape == image.shape
+    assert np.asarray(lazy_image) == pytest.approx(image)
+    with pytest.raises(ValueError):
+        spectro.grab_image(out=np.empty(spectro.image_shape), lazy=True)
+
+
+def test_peaks(spectro):
+    assert spectro.peaks == [(spectro.data_wavelength, spectro.width, spectro.amplitude, 'gauss', 0.5)]
+    spectro.noise = 1e-9
+    line_shape = spectro._get_line_shape()
+    spectro.peaks = [(528, 2, 10), (540, 3, 5, 'lorentz')]
+    spectro.background = 1.
+    assert len(spectro.peaks) == 2
+    assert np.all(spectro.grab_spectrum() > line_shape + 0.9)
+    spectro.peaks = None
+    assert spectro.grab_spectrum() == pytest.approx(line_shape + 1.)
+
+
+def test_replay_npy(spectro, tmp_path):
+    frames = np.arange(3 * 16, dtype=float).reshape((3, 16))
+    np.save(tmp_path / 'spectra.npy', frames)
+    spectro.load_replay(tmp_path / 'spectra.npy', loop=False)
+    assert spectro.replaying
+    assert spectro.spectrum_shape == (16,)
+    assert spectro.grab_spectrum() == pytest.approx(frames[0])
+    assert spectro.grab_spectra(2) == pytest.approx(frames[1:])
+    assert spectro.grab_spectrum() == pytest.approx(frames[-1])
+    assert spectro.grab_image().shape == spectro.image_shape == (spectro.Ny, 16)
+    spectro.stop_replay()
+    assert not spectro.replaying
+    assert spectro.grab_spectrum().shape == (spectro.Nx,)
+
+
+def test_replay_raw_images_loop(spectro, tmp_path):
+    frames = np.arange(2 * 4 * 8, dtype=np.uint16).reshape((2, 4, 8))
+    frames.tofile(tmp_path / 'images.raw')
+    with pytest.raises(ValueError):
+        spectro.load_replay(tmp_path / 'images.raw')
+    spectro.load_replay(tmp_path / 'images.raw', dtype='uint16', frame_shape=(4, 8))
+    assert spectro.image_shape == (4, 8)
+    assert spectro.grab_images(3) == pytest.approx(frames[[0, 1, 0]])
+    assert spectro.grab_spectrum() == pytest.approx(frames[1].sum(axis=0))
+    assert spectro.grab_monochromator() == pytest.approx(frames[0].sum(axis=0)[4])
+
+
+def test_replay_h5(spectro, tmp_path):
+    h5py = pytest.importorskip('h5py')
+    frames = np.random.rand(4, 32)
+    with h5py.File(tmp_path / 'spectra.h5', 'w') as h5file:
+        h5file['spectra'] = frames
+    spectro.load_replay(tmp_path / 'spectra.h5')
+    assert spectro.grab_spectra(4) == pytest.approx(frames)
+    lazy_image = spectro.grab_image(lazy=True)
+    assert np.asarray(lazy_image).sum(axis=0) == pytest.approx(spectro._get_y_profile().sum() * frames[0])
+    spectro.close_communication()
+    assert not spectro.replaying
+
+
+def test_sweep_settled(spectro):
+    spectro.noise = 1e-9
+    wavelengths, intensities = spectro.sweep(520, 536, 0.5, dwell=10 * spectro.tau)
+    assert wavelengths.shape == intensities.shape == (33,)
+    assert wavelengths == pytest.approx(np.linspace(520, 536, 33), abs=1e-3)
+    assert intensities == pytest.approx(spectro._get_response(wavelengths), abs=1e-6)
+    assert np.argmax(intensities) == 16
+    assert spectro.get_wavelength() == pytest.approx(536, abs=1e-3)
+
+
+def test_sweep_follows_motion_model(spectro):
+    dwell = spectro.tau / 5
+    wavelengths, _ = spectro.sweep(520, 510, 3, dwell)
+    assert len(wavelengths) == 4
+    assert np.all(np.diff(wavelengths) < 0)
+
+    stepped = Spectrometer()
+    positions = []
+    for target in (520, 517, 514, 511):
+        stepped.set_wavelength(target)
+        positions.append(float(stepped.wavelength_at(stepped._start_time + dwell)))
+        stepped._lambda = positions[-1]
+    assert wavelengths == pytest.approx(positions)
+    assert np.all(np.abs(wavelengths - [520, 517, 514, 511]) > 1e-3)
+
+
+def test_sweep_decimal_steps(spectro):
+    wavelengths, _ = spectro.sweep(500, 500.7, 0.1, spectro.tau)
+    assert len(wavelengths) == 8
+    assert spectro._target_lambda == pytest.approx(500.7)
+    wavelengths, _ = spectro.sweep(0.1, 0.7, 0.2, spectro.tau)
+    assert len(wavelengths) == 4
+    assert spectro._target_lambda == pytest.approx(0.7)
+    wavelengths, _ = spectro.sweep(500, 500.75, 0.1, spectro.tau)
+    assert len(wavelengths) == 8
+
+
+def test_sweep_invalid(spectro):
+    with pytest.raises(ValueError):
+        spectro.sweep(500, 510, 0, 0.1)
+    with pytest.raises(ValueError):
+        spectro.sweep(500, 510, 1, -0.1)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+
+from pymodaq_plugins_teaching.hardware.streaming import FrameRing
+
+
+def test_ring_latest_and_get():
+    ring = FrameRing(depth=3)
+    assert ring.latest() is None
+    assert ring.get(timeout=0.) is None
+    for ind in range(2):
+        ring.push(np.array([ind]))
+    assert ring.latest().index == 1
+    assert ring.get().index == 0
+    assert ring.get().index == 1
+    assert ring.dropped == 0
+
+
+def test_ring_drops_oldest_frames():
+    ring = FrameRing(depth=3)
+    for ind in range(10):
+        ring.push(np.array([ind]))
+    ring.close()
+    assert [frame.index for frame in ring] == [7, 8, 9]
+    assert ring.dropped == 7
+    assert ring.produced == 10
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import threading
+from time import perf_counter, sleep
+
+import pytest
+
+from pymodaq_plugins_teaching.hardware.spectrometer import Spectrometer
+from pymodaq_plugins_teaching.hardware.timing import ClockAborted, FrameClock
+
+
+def test_period():
+    assert FrameClock(0.01, 0.005).period == pytest.approx(0.015)
+    assert FrameClock(0.01, 0.005, max_fps=20).period == pytest.approx(0.05)
+    with pytest.raises(ValueError):
+        FrameClock(-1)
+    with pytest.raises(ValueError):
+        FrameClock(trigger='software')
+
+
+def test_internal_schedule_no_drift():
+    clock = FrameClock(0.005, 0.005)
+    t0 = clock._t0
+    for _ in range(10):
+        ready = clock.wait_frames()
+        assert perf_counter() >= ready
+    assert ready == pytest.approx(t0 + 9 * 0.01 + 0.01)
+    assert clock.delivered == 10
+    assert clock.missed == 0
+
+
+def test_internal_missed_frames():
+    clock = FrameClock(0.005, 0.005)
+    clock.wait_frames()
+    sleep(0.055)
+    clock.wait_frames(2)
+    assert clock.missed >= 4
+    assert clock.delivered == 3
+
+
+def test_external_trigger():
+    clock = FrameClock(0.01, 0., trigger='external')
+    with pytest.raises(TimeoutError):
+        clock.wait_frames(timeout=0.01)
+    clock.trigger()
+    clock.trigger()  # sensor busy
+    assert clock.missed == 1
+    start = perf_counter()
+    clock.wait_frames()
+    assert perf_counter() - start == pytest.approx(0.01, abs=0.01)
+    threading.Timer(0.02, clock.trigger).start()
+    assert clock.wait_frames(timeout=1.) > start + 0.02
+    with pytest.raises(RuntimeError):
+        FrameClock().trigger()
+
+
+def test_external_pending_triggers():
+    clock = FrameClock(0., 0., trigger='external')
+    now = perf_counter()
+    for delay in (3, 2, 1):
+        clock.trigger(now - delay)
+    assert clock.missed == 2  # a single unread frame is held
+    assert clock.wait_frames(timeout=0.01) == pytest.approx(now - 3)
+    with pytest.raises(TimeoutError):
+        clock.wait_frames(timeout=0.01)
+
+    timer = threading.Timer(0.02, lambda: [clock.trigger() for _ in range(3)])
+    timer.start()
+    clock.wait_frames(3, timeout=1.)  # the triggers waited for are all kept
+    timer.join()
+    assert clock.missed == 2
+    assert clock.delivered == 4
+
+
+@pytest.mark.parametrize('trigger', ['internal', 'external'])
+def test_abort(trigger):
+    clock = FrameClock(1., 0., trigger=trigger)
+    if trigger == 'external':
+        clock.trigger()
+        clock.wait_frames()
+    threading.Timer(0.02, clock.abort).start()
+    start = perf_counter()
+    with pytest.raises(ClockAborted):
+        clock.wait_frames()
+    assert perf_counter() - start < 0.5
+    assert clock.aborted
+    with pytest.raises(ClockAborted):
+        clock.wait_frames(timeout=0.01)
+    clock.resume()
+    assert not clock.aborted
+    if trigger == 'external':
+        with pytest.raises(TimeoutError):
+            clock.wait_frames(timeout=0.01)
+
+
+def test_stop_stream_waiting_for_triggers():
+    spectro = Spectrometer()
+    spectro.set_timing(exposure=0.01, trigger='external')
+    spectro.start_stream(rate=100)
+    sleep(0.02)
+    start = perf_counter()
+    spectro.stop_stream()
+    assert perf_counter() - start < 0.5
+    assert spectro.stream_error is None
+    assert not spectro.timing.aborted
+    spectro.trigger()
+    assert spectro.grab_spectrum().shape == spectro.spectrum_shape
+
+
+def test_spectrometer_timing():
+    spectro = Spectrometer()
+    assert spectro.timing is None
+    assert spectro.missed_frames == 0
+    with pytest.raises(RuntimeError):
+        spectro.trigger()
+    spectro.set_timing(exposure=0.02, readout=0.01)
+    start = perf_counter()
+    spectro.grab_spectra(3)
+    assert perf_counter() - start >= 0.09
+    spectro.set_timing(exposure=0.01, trigger='external')
+    spectro.trigger()
+    assert spectro.grab_spectrum().shape == spectro.spectrum_shape
+    spectro.disable_timing()
+    assert spectro.timing is None
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import os
+import sys
+
+import pytest
+
+from pymodaq_plugins_teaching.profile_import import profile_modules, _parse_importtime, _run
+
+# (seconds, MiB) budgets, about three times the cost measured on a developer machine. They can be scaled for slow
+# machines with the IMPORT_BUDGET_SCALE environment variable. Each import runs in fresh interpreters so the budget
+# tests are slow, and meaningless when other workers load the machine: they only run with IMPORT_BUDGET=1 and
+# without pytest-xdist, as done by a dedicated step of the CI
+IMPORT_BUDGETS = {
+    'pymodaq_plugins_teaching': (2.5, 100),
+    'pymodaq_plugins_teaching.hardware.spectrometer': (2.5, 100),
+    'pymodaq_plugins_teaching.hardware.keithley': (4., 250),
+    'pymodaq_plugins_teaching.extensions.myextension': (3., 100),
+}
+SCALE = float(os.environ.get('IMPORT_BUDGET_SCALE', 1.))
+
+# modules which should never be loaded by an import, checked on every run as a cheap guard against import regressions
+FORBIDDEN_IMPORTS = {
+    'pymodaq_plugins_teaching': ['pylablib', 'pymodaq_plugins_teaching.daq_move_plugins',
+                                 'pymodaq_plugins_teaching.daq_viewer_plugins', 'pymodaq_plugins_teaching.extensions',
+                                 'pymodaq_plugins_teaching.hardware'],
+    'pymodaq_plugins_teaching.hardware.spectrometer': ['pylablib', 'pymodaq_plugins_teaching.daq_viewer_plugins',
+                                                       'pymodaq_plugins_teaching.extensions'],
+}
+
+_LOADED_MODULES = """
+import importlib, json, sys
+importlib.import_module(sys.argv[1])
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+@pytest.mark.skipif(os.environ.get('IMPORT_BUDGET') != '1', reason='set IMPORT_BUDGET=1 to check the import budgets')
+@pytest.mark.skipif('PYTEST_XDIST_WORKER' in os.environ, reason='import times are not reliable under pytest-xdist')
+@pytest.mark.parametrize('module', IMPORT_BUDGETS)
+def test_import_budget(module):
+    seconds, mebibytes = IMPORT_BUDGETS[module]
+    profile, = profile_modules([module])
+    assert profile.seconds < seconds * SCALE, f'{module} import is too slow: {profile.breakdown[:10]}'
+    assert profile.peak_memory < mebibytes * SCALE * 2 ** 20
+
+
+@pytest.mark.parametrize('module', FORBIDDEN_IMPORTS)
+def test_forbidden_imports(module):
+    loaded, _ = _run(_LOADED_MODULES, module, sys.executable)
+    forbidden = FORBIDDEN_IMPORTS[module]
+    packages = tuple(f'{package}.' for package in forbidden)
+    assert [name for name in loaded if name in forbidden or name.startswith(packages)] == []
+
+
+def test_parse_importtime():
+    stderr = ('import time: self [us] | cumulative | imported package\n'
+              'import time:       120 |        120 |   numpy.core\n'
+              'import time:        30 |        150 | numpy\n')
+    breakdown = _parse_importtime(stderr)
+    assert [name for name, _ in breakdown] == ['numpy', 'numpy.core']
+    assert [seconds for _, seconds in breakdown] == pytest.approx([150e-6, 120e-6])
+
+
+def test_run_failure_without_error_output():
+    with pytest.raises(ImportError, match='no error output'):
+        _run('import sys; sys.exit(1)', 'pymodaq_plugins_teaching', sys.executable)
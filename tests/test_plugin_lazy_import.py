@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import importlib
+import logging
+import sys
+
+import pytest
+
+from pymodaq_plugins_teaching.utils import LazyPlugins
+
+
+def test_plugins_not_imported_at_package_import():
+    for name in list(sys.modules):
+        if name.startswith('pymodaq_plugins_teaching.daq_viewer_plugins.plugins_1D.'):
+            del sys.modules[name]
+    sys.modules.pop('pymodaq_plugins_teaching.daq_viewer_plugins.plugins_1D', None)
+    plugins_1D = importlib.import_module('pymodaq_plugins_teaching.daq_viewer_plugins.plugins_1D')
+    plugin_name = 'pymodaq_plugins_teaching.daq_viewer_plugins.plugins_1D.daq_1Dviewer_SpectrometerReplay'
+    assert plugin_name not in sys.modules
+    assert 'daq_1Dviewer_SpectrometerReplay' in dir(plugins_1D)
+    assert plugins_1D.path.parent.name == 'plugins_1D'
+
+    module = plugins_1D.daq_1Dviewer_SpectrometerReplay
+    assert sys.modules[plugin_name] is module
+    assert hasattr(module, 'DAQ_1DViewer_SpectrometerReplay')
+
+
+def test_import_failures_cached(tmp_path, monkeypatch):
+    package = tmp_path / 'lazy_package'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'broken.py').write_text('import a_module_that_does_not_exist\n')
+    (package / 'working.py').write_text('VALUE = 1\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.import_module('lazy_package')
+
+    plugins = LazyPlugins('lazy_package', package / '__init__.py', logging.getLogger('lazy_package'))
+    assert plugins.names == ['broken', 'working']
+    assert plugins.getattr('working').VALUE == 1
+    with pytest.raises(AttributeError):
+        plugins.getattr('not_a_plugin')
+    with pytest.raises(AttributeError):
+        plugins.getattr('broken')
+    assert isinstance(plugins.failures['broken'], ModuleNotFoundError)
+    with pytest.raises(AttributeError) as excinfo:
+        plugins.getattr('broken')
+    assert excinfo.value.__cause__ is plugins.failures['broken']
+    for name in ('lazy_package', 'lazy_package.working'):
+        sys.modules.pop(name, None)
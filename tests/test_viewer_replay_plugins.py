@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq_plugins_teaching.daq_viewer_plugins.plugins_1D.daq_1Dviewer_SpectrometerReplay import \
+    DAQ_1DViewer_SpectrometerReplay
+from pymodaq_plugins_teaching.daq_viewer_plugins.plugins_2D.daq_2Dviewer_SpectrometerReplay import \
+    DAQ_2DViewer_SpectrometerReplay
+
+
+@pytest.fixture
+def recorded_spectra(tmp_path):
+    frames = np.arange(3 * 16, dtype=float).reshape((3, 16))
+    np.save(tmp_path / 'spectra.npy', frames)
+    return tmp_path / 'spectra.npy', frames
+
+
+def grab(viewer) -> np.ndarray:
+    emitted = []
+    viewer.dte_signal.connect(emitted.append)
+    viewer.grab_data()
+    return emitted[-1][0][0]
+
+
+def test_1D_replay(qtbot, recorded_spectra):
+    path, frames = recorded_spectra
+    viewer = DAQ_1DViewer_SpectrometerReplay()
+    viewer.settings.child('replay_file').setValue(str(path))
+    info, initialized = viewer.ini_detector()
+    assert initialized
+    assert viewer.controller.replaying
+    assert grab(viewer) == pytest.approx(frames[0])
+    assert grab(viewer) == pytest.approx(frames[1])
+    viewer.settings.child('loop').setValue(False)  # reloads the frames from the start
+    viewer.commit_settings(viewer.settings.child('loop'))
+    assert grab(viewer) == pytest.approx(frames[0])
+    viewer.close()
+    assert not viewer.controller.replaying
+
+
+def test_2D_replay(qtbot, recorded_spectra):
+    path, frames = recorded_spectra
+    viewer = DAQ_2DViewer_SpectrometerReplay()
+    viewer.settings.child('replay_file').setValue(str(path))
+    viewer.ini_detector()
+    image = grab(viewer)
+    assert image.shape == viewer.controller.image_shape
+    assert image.sum(axis=0) == pytest.approx(viewer.controller._get_y_profile().sum() * frames[0])
+    viewer.close()